@@ -0,0 +1,297 @@
+import argparse
+import collections
+import json
+import platform
+import statistics
+import sys
+import sysconfig
+import time
+from Corrector import Corrector
+from Espanso import Espanso
+from LookupCache import LookupCache
+from Rule import Rule
+from RuleSet import RuleSet
+from SourceTree import SourceTree
+
+# Repeatable timings of the hot paths: parsing, lookups per match class (see
+# Espanso.ruleCategory), case preservation and the Espanso export. Results are
+# written as JSON and can be compared against a stored baseline to find regressions.
+class Benchmark:
+    version = 1
+
+    # the linear scan of Rule.getReplacementText is slow on misses, so it gets fewer inputs
+    sampleSize = 200
+    referenceSampleSize = 40
+
+    def __init__(self, file, repeat=5):
+        self.file = file
+        self.repeat = repeat
+        self.rules = RuleSet.fromFile(file)
+
+    # returns {name: (function, operationCount)} in the order they are run
+    def scenarios(self):
+        rules = list(self.rules)
+        scenarios = {
+            'parse.cleanFile': (lambda: Rule.cleanFile(self.file), 1),
+            'parse.fileToRuleList': (lambda: Rule.fileToRuleList(self.file), 1),
+            'ruleSet.build': (lambda: RuleSet(rules), 1),
+        }
+
+        for category in Espanso.categories:
+            for kind in ['hit', 'miss']:
+                inputs = self.inputs(category, kind == 'hit')
+                scenarios[f'lookup.{category}.{kind}'] = (Benchmark._lookup(self.rules, inputs), len(inputs))
+
+                # spread over the whole category, the linear scan gets slower further down the file
+                inputs = Benchmark.evenlySpaced(inputs, Benchmark.referenceSampleSize)
+                scenarios[f'getReplacementText.{category}.{kind}'] = (Benchmark._getReplacementText(rules, inputs), len(inputs))
+
+        # ex: 'Wriet-Output' => 'Write-Output'
+        cases = [(rule.oldText.capitalize() + '-Output', rule.oldText, rule.newText)
+                 for rule in self._sample('prefix') if not rule.caseSensitive]
+        scenarios['replacePreserveCase'] = (Benchmark._replacePreserveCase(cases), len(cases))
+
+        scenarios['convertToEspanso'] = (lambda: Rule.convertToEspanso(rules), 1)
+        return scenarios
+
+    # returns [(word, hasEndChar)] which are (or are not) corrected by a rule of category
+    def inputs(self, category, hit):
+        inputs = []
+        for rule in self._sample(category):
+            # a miss changes the last char of the trigger, ex: 'acess' => 'aceqz'
+            word = rule.oldText if hit else rule.oldText[:-1] + 'qz'
+            if category == 'prefix':
+                word += 'ed'
+            elif category == 'suffix':
+                word = 'my' + word
+
+            hasEndChar = category != 'prefix'
+            _, idx = self.rules.find(word, hasEndChar)
+            if hit and idx is not None and Espanso.ruleCategory(self.rules[idx]) == category:
+                inputs.append((word, hasEndChar))
+            elif not hit and idx is None:
+                inputs.append((word, hasEndChar))
+
+        return inputs
+
+    # rules of a category, evenly spaced through the file
+    def _sample(self, category):
+        rules = [rule for rule in self.rules if Espanso.ruleCategory(rule) == category]
+        return Benchmark.evenlySpaced(rules, Benchmark.sampleSize)
+
+    # returns at most count items, evenly spaced from the first to the last item
+    @staticmethod
+    def evenlySpaced(items, count):
+        if len(items) <= count:
+            return list(items)
+
+        return [items[idx * len(items) // count] for idx in range(count)]
+
+    @staticmethod
+    def _lookup(ruleSet, inputs):
+        def run():
+            for word, hasEndChar in inputs:
+                ruleSet.find(word, hasEndChar)
+        return run
+
+    @staticmethod
+    def _getReplacementText(rules, inputs):
+        def run():
+            for word, hasEndChar in inputs:
+                Rule.getReplacementText(rules, word, hasEndChar)
+        return run
+
+    @staticmethod
+    def _replacePreserveCase(cases):
+        def run():
+            for inputText, oldText, newText in cases:
+                Rule._replacePreserveCase(inputText, oldText, newText)
+        return run
+
+    # runs the scenarios whose name contains nameFilter and returns the JSON report
+    def run(self, nameFilter=''):
+        results = {}
+        for name, (function, ops) in self.scenarios().items():
+            if nameFilter in name:
+                results[name] = Benchmark.time(function, ops, self.repeat)
+
+        return {
+            'version': Benchmark.version,
+            'python': platform.python_version(),
+            'rules': len(self.rules),
+            'scenarios': results,
+        }
+
+    # times repeat runs of function (after one warm-up run). the best run is the
+    # least disturbed by other processes, so it is the one compared
+    @staticmethod
+    def time(function, ops, repeat):
+        function()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+
+        best = min(times)
+        return {
+            'ops': ops,
+            'best': best,
+            'median': statistics.median(times),
+            'nsPerOp': best / max(ops, 1) * 1e9,
+        }
+
+    # returns [(name, baselineNsPerOp, nsPerOp, ratio, isRegression)] for the scenarios
+    # in both reports. a scenario regressed when it is more than threshold slower
+    @staticmethod
+    def compare(baseline, report, threshold=0.1):
+        rows = []
+        for name, result in report['scenarios'].items():
+            old = baseline['scenarios'].get(name)
+            if old is None:
+                continue
+
+            ratio = result['nsPerOp'] / old['nsPerOp'] if old['nsPerOp'] else 1.0
+            rows.append((name, old['nsPerOp'], result['nsPerOp'], ratio, ratio > 1 + threshold))
+
+        return rows
+
+# Replays a corpus of real files (code and prose) through the rules. Text is split into words
+# on the script's '#Hotstring EndChars' like Corrector does, which gives a realistic (Zipf
+# distributed) workload and finds corrections of words which are not typos at scale.
+class CorpusReplay:
+    def __init__(self, corrector: Corrector, lexicon=(), minCount=3):
+        self.corrector = corrector
+        self.lexicon = frozenset(word.lower() for word in lexicon)
+        self.minCount = minCount
+
+    @staticmethod
+    def fromFile(file, lexicon=(), minCount=3):
+        return CorpusReplay(Corrector.fromFile(file), lexicon, minCount)
+
+    # the standard library of the running Python, used when no corpus is given
+    @staticmethod
+    def defaultCorpus():
+        return [sysconfig.get_paths()['stdlib']]
+
+    # yields the text of every text file under paths (files or directories), see SourceTree
+    @staticmethod
+    def iterTexts(paths):
+        return (text for _, text in SourceTree.iterTexts(paths))
+
+    # returns the JSON report for the texts. only tokenizing and correcting is timed
+    def run(self, texts, top=50):
+        ruleSet = self.corrector.ruleSet
+        files = 0
+        tokens = 0
+        seconds = 0.0
+        matches = collections.Counter()
+        corrections = collections.Counter()
+        for text in texts:
+            files += 1
+            start = time.perf_counter()
+            for word, endChar in self.corrector.tokenize([text]):
+                if not Corrector.isWord(word):
+                    continue
+
+                tokens += 1
+                newText, rule = ruleSet.correct(word, endChar != '')
+                if rule is not None:
+                    matches[Espanso.ruleCategory(rule)] += 1
+                    if newText != word:
+                        corrections[word, newText, rule.line] += 1
+            seconds += time.perf_counter() - start
+
+        suspects = [{'word': word, 'newText': newText, 'count': count, 'rule': line}
+                    for (word, newText, line), count in corrections.most_common()
+                    if self.isSuspect(word, count)]
+
+        return {
+            'files': files,
+            'tokens': tokens,
+            'seconds': seconds,
+            'tokensPerSecond': tokens / seconds if seconds else 0.0,
+            'matches': {category: matches[category] for category in Espanso.categories},
+            'matchRate': {category: matches[category] / tokens if tokens else 0.0 for category in Espanso.categories},
+            'corrections': sum(corrections.values()),
+            'suspects': suspects[:top],
+        }
+
+    # a correction is suspect when the word is in the lexicon or is corrected so often that it
+    # is more likely a real identifier or word than a typo, ex: MATCH_NONE_LIST in testMatchNone.py
+    def isSuspect(self, word, count):
+        return count >= self.minCount or word.lower() in self.lexicon
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the AutocorrectForDevelopers rule engine.')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    parser.add_argument('-o', '--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', help='compare against a JSON file from an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.1, help='slowdown which counts as a regression (default: 0.1)')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per scenario')
+    parser.add_argument('--filter', default='', help='only run scenarios whose name contains this text')
+    parser.add_argument('--corpus', nargs='*', metavar='PATH',
+                        help='replay the files under these paths instead (default: the Python standard library)')
+    parser.add_argument('--lexicon', help='word list file. corrections of these words are reported')
+    parser.add_argument('--min-count', type=int, default=3, help='report corrections made at least this often')
+    parser.add_argument('--top', type=int, default=50, help='number of suspect corrections to report')
+    parser.add_argument('--cache', type=int, default=0, metavar='SIZE', help='replay through a LookupCache of this size')
+    args = parser.parse_args(argv)
+
+    if args.corpus is not None:
+        return replayCorpus(args)
+
+    report = Benchmark(args.rules, args.repeat).run(args.filter)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if not args.compare:
+        for name, result in report['scenarios'].items():
+            print(f'{name:40} {result["nsPerOp"]:14,.0f} ns/op')
+        return 0
+
+    with open(args.compare, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = 0
+    for name, oldNs, newNs, ratio, isRegression in Benchmark.compare(baseline, report, args.threshold):
+        regressions += isRegression
+        flag = '  REGRESSION' if isRegression else ''
+        print(f'{name:40} {oldNs:14,.0f} -> {newNs:14,.0f} ns/op {ratio:6.2f}x{flag}')
+
+    return 1 if regressions else 0
+
+def replayCorpus(args):
+    lexicon = []
+    if args.lexicon:
+        with open(args.lexicon, encoding='utf-8') as f:
+            lexicon = f.read().split()
+
+    replay = CorpusReplay.fromFile(args.rules, lexicon, args.min_count)
+    if args.cache:
+        replay.corrector.ruleSet = LookupCache(replay.corrector.ruleSet, args.cache)
+
+    report = replay.run(CorpusReplay.iterTexts(args.corpus or CorpusReplay.defaultCorpus()), args.top)
+    if args.cache:
+        report['cache'] = replay.corrector.ruleSet.stats()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    print(f'files: {report["files"]}')
+    print(f'tokens: {report["tokens"]} ({report["tokensPerSecond"]:,.0f} per second)')
+    for category in Espanso.categories:
+        print(f'{category}: {report["matches"][category]} ({report["matchRate"][category]:.4%})')
+
+    if args.cache:
+        print(f'cache hit rate: {report["cache"]["hitRate"]:.2%}')
+
+    print(f'corrections: {report["corrections"]}')
+    for suspect in report['suspects']:
+        print(f'{suspect["count"]:8} {suspect["word"]} -> {suspect["newText"]}    {suspect["rule"]}')
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import argparse
+import collections
+import re
+import sys
+from InstrumentedRuleSet import InstrumentedRuleSet
+from LookupCache import LookupCache
+from Rule import Rule
+from RuleSet import RuleSet
+
+# one correction made to the input. offset is the character offset of oldText in the input
+Edit = collections.namedtuple('Edit', ['offset', 'oldText', 'newText', 'rule'])
+
+# Applies the rules to a whole document. Text is read in chunks and split into words
+# on the script's '#Hotstring EndChars', so the input is never loaded into memory at once.
+# Each word is looked up on its own, so rules whose trigger contains an ending char never
+# fire, ex: '::abl eto::able to'. HotstringSimulator replays those keystroke by keystroke.
+class Corrector:
+    chunkSize = 1 << 16
+
+    # words this long are passed through uncorrected, like text which no longer fits in
+    # AHK's 100 char hotstring buffer. a run without ending chars (ex: base64) is passed on
+    # once it is longer than maxCarry, so memory stays bounded
+    maxWordLength = 100
+    maxCarry = 1 << 16
+
+    def __init__(self, ruleSet: RuleSet, endChars):
+        self.ruleSet = ruleSet
+        self.endChars = frozenset(endChars)
+        self.endCharPattern = re.compile('[' + re.escape(''.join(sorted(self.endChars))) + ']')
+
+    @staticmethod
+    def fromFile(file):
+        return Corrector(RuleSet.fromFile(file), Rule.getEndChars(file))
+
+    # yields (word, endChar) for every word in chunks. endChar is '' for the last word
+    # when the text does not finish with an ending char. words may be empty, ex: '()'
+    def tokenize(self, chunks):
+        carry = ''
+        for chunk in chunks:
+            text = carry + chunk
+            pos = 0
+            for match in self.endCharPattern.finditer(text):
+                yield text[pos:match.start()], match.group()
+                pos = match.end()
+
+            # the rest of the chunk may be the start of a word which continues in the next chunk
+            carry = text[pos:]
+            if len(carry) > Corrector.maxCarry:
+                # both pieces are at least maxWordLength long, so neither is looked up
+                yield carry[:-Corrector.maxWordLength], ''
+                carry = carry[-Corrector.maxWordLength:]
+
+        if carry:
+            yield carry, ''
+
+    # true for the words which are looked up, see maxWordLength
+    @staticmethod
+    def isWord(word):
+        return 0 < len(word) < Corrector.maxWordLength
+
+    # yields the corrected text in pieces of about 4096 words. edits are appended to the edits list
+    def correct(self, chunks, edits=None):
+        offset = 0
+        pieces = []
+        for word, endChar in self.tokenize(chunks):
+            newText = word
+            if Corrector.isWord(word):
+                newText, rule = self.ruleSet.correct(word, endChar != '')
+                if rule is not None and newText != word and edits is not None:
+                    edits.append(Edit(offset, word, newText, rule))
+
+            pieces.append(newText)
+            pieces.append(endChar)
+            offset += len(word) + len(endChar)
+
+            if len(pieces) >= 4096:
+                yield ''.join(pieces)
+                pieces = []
+
+        if pieces:
+            yield ''.join(pieces)
+
+    # corrects inStream into outStream and returns the list of edits
+    def correctStream(self, inStream, outStream):
+        edits = []
+        chunks = iter(lambda: inStream.read(Corrector.chunkSize), '')
+        for text in self.correct(chunks, edits):
+            outStream.write(text)
+
+        return edits
+
+    # returns (correctedText, edits) for a string
+    def correctText(self, text: str):
+        edits = []
+        return ''.join(self.correct([text], edits)), edits
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Autocorrect a text file using AutocorrectForDevelopers rules.')
+    parser.add_argument('input', nargs='?', help='file to correct (default: stdin)')
+    parser.add_argument('-o', '--output', help='file to write corrected text to (default: stdout)')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    parser.add_argument('--edits', action='store_true', help='print each edit to stderr')
+    parser.add_argument('--stats', action='store_true', help='print rule hit counts and lookup latency to stderr')
+    parser.add_argument('--stats-json', metavar='FILE', help='write rule hit counts and lookup latency to a JSON file')
+    parser.add_argument('--cache', type=int, default=0, metavar='SIZE', help='cache this many word lookups')
+    args = parser.parse_args(argv)
+
+    corrector = Corrector.fromFile(args.rules)
+    if args.cache:
+        corrector.ruleSet = LookupCache(corrector.ruleSet, args.cache)
+    if args.stats or args.stats_json:
+        corrector.ruleSet = InstrumentedRuleSet(corrector.ruleSet)
+    inStream = open(args.input, encoding='utf-8') if args.input else sys.stdin
+    outStream = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        edits = corrector.correctStream(inStream, outStream)
+    finally:
+        if args.input:
+            inStream.close()
+        if args.output:
+            outStream.close()
+
+    if args.edits:
+        for edit in edits:
+            print(f'{edit.offset}: {edit.oldText} -> {edit.newText}', file=sys.stderr)
+
+    if args.stats:
+        sys.stderr.write(corrector.ruleSet.report())
+    if args.stats_json:
+        with open(args.stats_json, 'w', encoding='utf-8') as f:
+            f.write(corrector.ruleSet.toJson())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+import argparse
+import hashlib
+import json
+import os
+from Rule import Rule
+from RuleSet import RuleSet
+
+# Espanso export modes built on Rule.convertOneRuleToEspanso
+class Espanso:
+    manifestVersion = 1
+    indexFileName = 'index.json'
+
+    # shards in the order they are listed in the index
+    categories = ['whitelist', 'exact', 'caseSensitive', 'prefix', 'suffix']
+
+    # Writes the Espanso YAML for rules to yamlFile, skipping the write when nothing changed
+    # since the last call. A manifest next to the YAML keeps a content hash and byte length of
+    # every rule's block (in file order). Changed blocks are only written in place when they
+    # keep their size; otherwise every byte after the first changed rule is rewritten, which
+    # for most edits is most of the file. Returns False when nothing had to be written.
+    @staticmethod
+    def writeIncremental(rules, yamlFile, manifestFile=None):
+        manifestFile = manifestFile or yamlFile + '.manifest.json'
+
+        preamble = Rule.espansoPreamble.encode('utf-8')
+        blocks = [Rule.convertOneRuleToEspanso(rule).encode('utf-8') for rule in rules]
+        hashes = [hashlib.sha1(block).hexdigest() for block in blocks]
+
+        manifest = Espanso._readManifest(manifestFile, yamlFile)
+        if manifest is None or manifest['preamble'] != hashlib.sha1(preamble).hexdigest():
+            # no usable manifest, so write everything
+            Espanso._removeManifest(manifestFile)
+            with open(yamlFile, 'wb') as f:
+                f.write(preamble)
+                f.writelines(blocks)
+        else:
+            oldHashes = [ruleHash for ruleHash, _ in manifest['rules']]
+            if oldHashes == hashes:
+                return False
+
+            Espanso._removeManifest(manifestFile)
+            Espanso._patch(yamlFile, len(preamble), manifest['rules'], blocks, hashes)
+
+        Espanso._writeManifest(manifestFile, yamlFile, preamble, blocks, hashes)
+        return True
+
+    # rewrites the blocks between the unchanged rules at the start and end of the file. when
+    # the changed blocks have a different size, everything after them moves, so the whole
+    # rest of the file is rewritten
+    @staticmethod
+    def _patch(yamlFile, preambleLength, oldRules, blocks, hashes):
+        oldHashes = [ruleHash for ruleHash, _ in oldRules]
+
+        # number of unchanged rules at the start, then at the end
+        start = 0
+        maxCommon = min(len(oldHashes), len(hashes))
+        while start < maxCommon and oldHashes[start] == hashes[start]:
+            start += 1
+
+        end = 0
+        while end < maxCommon - start and oldHashes[-1 - end] == hashes[-1 - end]:
+            end += 1
+
+        offset = preambleLength + sum(length for _, length in oldRules[:start])
+        oldLength = sum(length for _, length in oldRules[start:len(oldRules) - end])
+        newBlocks = blocks[start:len(blocks) - end]
+
+        with open(yamlFile, 'r+b') as f:
+            f.seek(offset)
+            if sum(len(block) for block in newBlocks) == oldLength:
+                # same size, so overwrite the changed blocks in place
+                f.writelines(newBlocks)
+            else:
+                f.writelines(blocks[start:])
+                f.truncate()
+
+    @staticmethod
+    def _readManifest(manifestFile, yamlFile):
+        try:
+            with open(manifestFile, encoding='utf-8') as f:
+                manifest = json.load(f)
+
+            with open(yamlFile, 'rb') as f:
+                yamlHash = hashlib.sha256(f.read()).hexdigest()
+        except (OSError, ValueError):
+            return None
+
+        # ignore the manifest if it is from another version or the YAML was changed by hand
+        if manifest.get('version') != Espanso.manifestVersion or manifest.get('yaml') != yamlHash:
+            return None
+
+        return manifest
+
+    @staticmethod
+    def _writeManifest(manifestFile, yamlFile, preamble, blocks, hashes):
+        with open(yamlFile, 'rb') as f:
+            yamlHash = hashlib.sha256(f.read()).hexdigest()
+
+        manifest = {
+            'version': Espanso.manifestVersion,
+            'yaml': yamlHash,
+            'preamble': hashlib.sha1(preamble).hexdigest(),
+            'rules': [[ruleHash, len(block)] for ruleHash, block in zip(hashes, blocks)],
+        }
+
+        with open(manifestFile, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+    @staticmethod
+    def _removeManifest(manifestFile):
+        # removed before the YAML changes, so an interrupted write is never trusted
+        if os.path.exists(manifestFile):
+            os.remove(manifestFile)
+
+    # Splits the rules into one Espanso match file per category (see ruleCategory), and
+    # optionally per first trigger character, ex: 'exact_a.yml'. Espanso merges every file
+    # in its match directory, so the shards behave like the single YAML file. index.json
+    # lists the shards. Only shards whose content changed are written and shards which are
+    # no longer needed are removed. Returns the names of the files which were written.
+    @staticmethod
+    def writeShards(rules, directory, byFirstChar=False):
+        shards = {}
+        for rule in rules:
+            block = Rule.convertOneRuleToEspanso(rule)
+            if block:
+                shards.setdefault(Espanso.shardName(rule, byFirstChar), []).append(block)
+
+        os.makedirs(directory, exist_ok=True)
+        oldIndex = Espanso._readIndex(directory)
+
+        written = []
+        index = []
+        for name in sorted(shards, key=Espanso._shardSortKey):
+            data = (Rule.espansoPreamble + ''.join(shards[name])).encode('utf-8')
+            fileName = name + '.yml'
+            if Espanso._writeIfChanged(os.path.join(directory, fileName), data):
+                written.append(fileName)
+
+            index.append({'file': fileName, 'rules': len(shards[name]), 'sha256': hashlib.sha256(data).hexdigest()})
+
+        # remove shards from an earlier run, ex: a first char with no rules left
+        fileNames = {shard['file'] for shard in index}
+        for shard in oldIndex:
+            if shard['file'] not in fileNames and os.path.exists(os.path.join(directory, shard['file'])):
+                os.remove(os.path.join(directory, shard['file']))
+
+        indexData = json.dumps({'version': Espanso.manifestVersion, 'shards': index}, indent=2) + '\n'
+        if Espanso._writeIfChanged(os.path.join(directory, Espanso.indexFileName), indexData.encode('utf-8')):
+            written.append(Espanso.indexFileName)
+
+        return written
+
+    # returns the shard a rule belongs to, ex: 'prefix' or 'prefix_a' when byFirstChar is set
+    @staticmethod
+    def shardName(rule, byFirstChar=False):
+        category = Espanso.ruleCategory(rule)
+        if not byFirstChar:
+            return category
+
+        firstChar = rule.oldTextLower[:1]
+        if not ('a' <= firstChar <= 'z' or '0' <= firstChar <= '9'):
+            # keep file names portable
+            firstChar = 'other'
+
+        return f'{category}_{firstChar}'
+
+    # returns one of Espanso.categories. whitelists win over every other option,
+    # and prefix and suffix rules are grouped regardless of case sensitivity
+    @staticmethod
+    def ruleCategory(rule):
+        if rule.backspace:
+            return 'whitelist'
+        if rule.prefixMatch:
+            return 'prefix'
+        if rule.suffixMatch:
+            return 'suffix'
+        if rule.caseSensitive:
+            return 'caseSensitive'
+        return 'exact'
+
+    @staticmethod
+    def _shardSortKey(name):
+        category, _, firstChar = name.partition('_')
+        return Espanso.categories.index(category), firstChar
+
+    @staticmethod
+    def _readIndex(directory):
+        try:
+            with open(os.path.join(directory, Espanso.indexFileName), encoding='utf-8') as f:
+                return json.load(f).get('shards', [])
+        except (OSError, ValueError):
+            return []
+
+    # compares against the file on disk (not the index), so hand edits are also replaced
+    @staticmethod
+    def _writeIfChanged(file, data):
+        try:
+            with open(file, 'rb') as f:
+                if f.read() == data:
+                    return False
+        except OSError:
+            pass
+
+        with open(file, 'wb') as f:
+            f.write(data)
+
+        return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export AutocorrectForDevelopers rules to Espanso.')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    parser.add_argument('-o', '--output', default='AutocorrectForDevelopers.yaml', help='YAML file to update')
+    parser.add_argument('--shards', metavar='DIR', help='write one match file per rule category to DIR instead')
+    parser.add_argument('--by-first-char', action='store_true', help='also split the shards by first trigger char')
+    args = parser.parse_args(argv)
+
+    rules = RuleSet.fromFile(args.rules)
+    if args.shards:
+        for fileName in Espanso.writeShards(rules, args.shards, args.by_first_char):
+            print(f'wrote {fileName}')
+    elif Espanso.writeIncremental(rules, args.output):
+        print(f'wrote {args.output}')
+
+if __name__ == '__main__':
+    main()
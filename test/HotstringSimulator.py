@@ -0,0 +1,176 @@
+import argparse
+import collections
+from Rule import Rule
+from RuleSet import RuleSet
+from Trie import Trie
+
+# one hotstring which fired. AHK erases the last 'backspaces' characters of word, then
+# sends text. replacement is the word as it appears afterwards. b0 rules erase and send nothing.
+Event = collections.namedtuple('Event', ['position', 'rule', 'word', 'replacement', 'backspaces', 'text'])
+
+# Emulates the AHK hotstring recognizer one keystroke at a time:
+#   - every typed key (including ending chars) is added to the recognizer buffer
+#   - prefix rules (':*:') fire the moment their last character is typed
+#   - all other rules are checked when an ending char is typed
+#   - rules without '?' only match at the start of the buffer or after a non-alphanumeric char
+#   - when rules tie, the first one in the script wins
+#   - backspace ('\b') removes the last character from the buffer
+# After a rule fires, the buffer holds the replacement text, which is what is on screen.
+#
+# Prefix rules are tracked with one PrefixCursor per word start which can still match,
+# and ending chars walk a reversed trie over the (at most 100 char) buffer, so the work
+# per keystroke does not depend on the number of rules.
+class HotstringSimulator:
+    backspaceKey = '\b'
+
+    # AHK keeps the last 100 typed characters and drops the oldest half when full
+    maxBufferLength = 100
+
+    def __init__(self, ruleSet: RuleSet, endChars):
+        self.ruleSet = ruleSet
+        self.endChars = frozenset(endChars)
+
+        # rules which need an ending char, stored back to front
+        self.endCharTrie = Trie(reverse=True)
+        self.endCharTrieLower = Trie(reverse=True)
+        for idx, rule in enumerate(ruleSet):
+            if rule.prefixMatch:
+                continue
+
+            if rule.caseSensitive:
+                self.endCharTrie.insert(rule.oldText, idx)
+            else:
+                self.endCharTrieLower.insert(rule.oldTextLower, idx)
+
+        self.reset()
+
+    @staticmethod
+    def fromFile(file):
+        return HotstringSimulator(RuleSet.fromFile(file), Rule.getEndChars(file))
+
+    # forget everything typed so far, like AHK does after a mouse click
+    def reset(self):
+        self.position = 0
+        self.buffer = []
+        # cursors[i] holds the prefix cursors which are still alive after buffer[:i],
+        # so that backspace is a pop
+        self.cursors = [()]
+
+    # types one key and returns the Event it fired (or None)
+    def press(self, key: str):
+        position = self.position
+        self.position += 1
+
+        if key == HotstringSimulator.backspaceKey:
+            if self.buffer:
+                self.buffer.pop()
+                self.cursors.pop()
+            return None
+
+        event = None
+        if key in self.endChars:
+            event = self._matchEndCharRules(position)
+
+        if event is None:
+            idx = self._append(key)
+            if idx is not None:
+                # a prefix rule completed, which fires without waiting for an ending char
+                event = self._fire(position, self.ruleSet[idx])
+        else:
+            self._append(key)
+
+        if len(self.buffer) > HotstringSimulator.maxBufferLength:
+            half = HotstringSimulator.maxBufferLength // 2
+            del self.buffer[:half]
+            del self.cursors[:half]
+
+        return event
+
+    # types every key and yields the events which fired
+    def simulate(self, keys):
+        for key in keys:
+            event = self.press(key)
+            if event is not None:
+                yield event
+
+    # adds char to the buffer. returns the index of the prefix rule it completes (or None)
+    def _append(self, char):
+        cursors = [cursor.copy() for cursor in self.cursors[-1]]
+        if not self.buffer or not self.buffer[-1].isalnum():
+            # a new word starts here
+            cursors.append(self.ruleSet.prefixCursor())
+
+        matches = [cursor.advance(char) for cursor in cursors]
+        matches = [idx for idx in matches if idx is not None]
+
+        self.buffer.append(char)
+        self.cursors.append(tuple(cursor for cursor in cursors if not cursor.isDead()))
+        return min(matches) if matches else None
+
+    def _matchEndCharRules(self, position):
+        if not self.buffer:
+            return None
+
+        text = ''.join(self.buffer)
+        candidates = list(self.endCharTrie.iterMatches(text))
+        candidates.extend(self.endCharTrieLower.iterMatches(text.lower()))
+        candidates = [idx for idx in candidates if self._isWordStart(text, self.ruleSet[idx])]
+        if not candidates:
+            return None
+
+        return self._fire(position, self.ruleSet[min(candidates)])
+
+    # rules without '?' must not be preceded by an alphanumeric char
+    def _isWordStart(self, text, rule):
+        start = len(text) - len(rule.oldText)
+        return rule.suffixMatch or start == 0 or not text[start - 1].isalnum()
+
+    def _fire(self, position, rule):
+        text = ''.join(self.buffer)
+        typed = text[len(text) - len(rule.oldText):]
+
+        if rule.backspace:
+            return Event(position, rule, text, text, 0, '')
+
+        newText = rule.newText
+        if not rule.caseSensitive:
+            newText = Rule.conformCase(typed, newText)
+
+        replacement = text[:len(text) - len(typed)] + newText
+
+        # replay the replacement into the buffer so prefix cursors match what is on screen
+        del self.buffer[len(text) - len(typed):]
+        del self.cursors[len(self.buffer) + 1:]
+        for char in newText:
+            self._append(char)
+
+        return Event(position, rule, text, replacement, len(typed), newText)
+
+# returns the type of hotstring which fired, ex: 'prefix'
+def eventType(event: Event):
+    if event.rule.backspace:
+        return 'whitelist'
+    if event.rule.prefixMatch:
+        return 'prefix'
+    if event.rule.suffixMatch:
+        return 'suffix'
+    return 'exact'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a recorded typing session through the AHK hotstring rules.')
+    parser.add_argument('session', help='file of typed keys (backspace is \\b)')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    args = parser.parse_args(argv)
+
+    simulator = HotstringSimulator.fromFile(args.rules)
+    counts = collections.Counter()
+    with open(args.session, encoding='utf-8', newline='') as f:
+        for chunk in iter(lambda: f.read(1 << 16), ''):
+            counts.update(eventType(event) for event in simulator.simulate(chunk))
+
+    print(f'keys: {simulator.position}')
+    for name in ['exact', 'prefix', 'suffix', 'whitelist']:
+        print(f'{name}: {counts[name]}')
+
+if __name__ == '__main__':
+    main()
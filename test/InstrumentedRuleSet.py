@@ -0,0 +1,92 @@
+import collections
+import json
+import time
+from RuleSet import RuleSet, RuleSetProxy
+
+# Wraps a RuleSet and records, for every lookup: which rule fired (or a miss), which
+# branch of Rule.matchRule fired and how long the lookup took. Pass it anywhere a RuleSet
+# is used, ex: Corrector(InstrumentedRuleSet(ruleSet), endChars). Code which uses the
+# RuleSet directly pays nothing for the instrumentation.
+class InstrumentedRuleSet(RuleSetProxy):
+    branches = ['exact', 'whitelist', 'prefix', 'suffix']
+
+    def __init__(self, ruleSet: RuleSet):
+        super().__init__(ruleSet)
+        self.reset()
+
+    def reset(self):
+        self.lookups = 0
+        self.misses = 0
+        self.totalNs = 0
+        self.hits = collections.Counter()
+        self.branchCounts = collections.Counter()
+        # lookup latency, bucketed by powers of two: histogram[k] counts lookups taking < 2**k ns
+        self.histogram = collections.Counter()
+
+    def find(self, word: str, hasEndChar: bool):
+        start = time.perf_counter_ns()
+        newText, idx = self.ruleSet.find(word, hasEndChar)
+        elapsed = time.perf_counter_ns() - start
+
+        self.lookups += 1
+        self.totalNs += elapsed
+        self.histogram[elapsed.bit_length()] += 1
+        if idx is None:
+            self.misses += 1
+        else:
+            self.hits[idx] += 1
+            self.branchCounts[InstrumentedRuleSet.matchBranch(self.rules[idx], word, hasEndChar)] += 1
+
+        return newText, idx
+
+    # returns which branch of Rule.matchRule made rule fire for word, ex: 'prefix'
+    @staticmethod
+    def matchBranch(rule, word: str, hasEndChar: bool):
+        if rule.backspace:
+            return 'whitelist'
+
+        if rule.caseSensitive:
+            isEqual = word == rule.oldText
+        else:
+            isEqual = word.lower() == rule.oldTextLower
+
+        if isEqual and hasEndChar:
+            return 'exact'
+
+        if rule.prefixMatch and (word if rule.caseSensitive else word.lower()).startswith(rule.oldText):
+            return 'prefix'
+
+        return 'suffix'
+
+    # returns the statistics as a JSON compatible dict. rules are sorted by hit count
+    def stats(self):
+        return {
+            'lookups': self.lookups,
+            'misses': self.misses,
+            'totalNs': self.totalNs,
+            'meanNs': self.totalNs / self.lookups if self.lookups else 0.0,
+            'branches': {branch: self.branchCounts[branch] for branch in InstrumentedRuleSet.branches},
+            'histogram': {f'<{1 << bucket}ns': self.histogram[bucket] for bucket in sorted(self.histogram)},
+            'unusedRules': len(self.rules) - len(self.hits),
+            'rules': [{'idx': idx, 'line': self.rules[idx].line, 'hits': hits} for idx, hits in self.hits.most_common()],
+        }
+
+    def toJson(self):
+        return json.dumps(self.stats(), indent=2)
+
+    # returns a human readable summary with the top most frequent rules
+    def report(self, top=20):
+        stats = self.stats()
+        lines = [
+            f'lookups: {stats["lookups"]}',
+            f'misses: {stats["misses"]}',
+            f'mean latency: {stats["meanNs"]:,.0f} ns',
+            f'rules which never fired: {stats["unusedRules"]} of {len(self.rules)}',
+            'branches:',
+        ]
+        lines.extend(f'  {branch}: {count}' for branch, count in stats['branches'].items())
+        lines.append('latency:')
+        lines.extend(f'  {bucket:>14}: {count}' for bucket, count in stats['histogram'].items())
+        lines.append('top rules:')
+        lines.extend(f'  {rule["hits"]:8} {rule["line"]}' for rule in stats['rules'][:top])
+        return '\n'.join(lines) + '\n'
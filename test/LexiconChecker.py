@@ -0,0 +1,92 @@
+import argparse
+import os
+from Rule import Rule
+from RuleSet import RuleSet
+
+# Finds real words which prefix (':*:') and suffix (':?:') rules would corrupt, offline,
+# instead of checking every new rule by hand with the word tools in the AHK header.
+# The lexicon is read once and every word is looked up through the RuleSet tries, so
+# whitelists and rule precedence apply exactly as when typing the word.
+class LexiconChecker:
+    defaultLexicon = '/usr/share/dict/words'
+
+    def __init__(self, ruleSet: RuleSet, endChars):
+        self.ruleSet = ruleSet
+        self.endChars = frozenset(endChars)
+
+    @staticmethod
+    def fromFile(file):
+        return LexiconChecker(RuleSet.fromFile(file), Rule.getEndChars(file))
+
+    # returns a checker whose rules are the current rules followed by candidate rule lines,
+    # and the indices of the candidates. ex: ':?:aign::aing'
+    def withCandidates(self, lines):
+        rules = list(self.ruleSet)
+        candidates = range(len(rules), len(rules) + len(lines))
+        rules.extend(Rule.lineToRule(line) for line in lines)
+        return LexiconChecker(RuleSet(rules), self.endChars), candidates
+
+    # exits through parser.error when the word list file does not exist. the default lexicon
+    # is missing on systems without a words package
+    @staticmethod
+    def checkLexicon(parser, file):
+        if not os.path.isfile(file):
+            parser.error(f'lexicon not found: {file}. Pass a word list, one word per line, with --lexicon')
+
+    # yields the words of a word list file, one per line
+    @staticmethod
+    def readLexicon(file):
+        with open(file, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                word = line.strip()
+                if word:
+                    yield word
+
+    # returns {rule idx: [(word, correctedWord)]} for the prefix and suffix rules which change
+    # a word typed followed by an ending char. only rules in ruleIndices are reported when given
+    def collisions(self, words, ruleIndices=None):
+        ruleIndices = None if ruleIndices is None else set(ruleIndices)
+        collisions = {}
+        for word in words:
+            # a word with an ending char in it is never typed as one token
+            if any(char in self.endChars for char in word):
+                continue
+
+            _, idx = self.ruleSet.find(word, True)
+            if idx is None or (ruleIndices is not None and idx not in ruleIndices):
+                continue
+
+            rule = self.ruleSet[idx]
+            if not rule.prefixMatch and not rule.suffixMatch:
+                continue
+
+            newText, _ = self.ruleSet.correct(word, True)
+            if newText != word:
+                collisions.setdefault(idx, []).append((word, newText))
+
+        return collisions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='List real words which prefix and suffix rules would corrupt.')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    parser.add_argument('--lexicon', default=LexiconChecker.defaultLexicon, help='word list, one word per line')
+    parser.add_argument('--candidates', help='file of new rule lines to check instead of the existing rules')
+    args = parser.parse_args(argv)
+    LexiconChecker.checkLexicon(parser, args.lexicon)
+
+    checker = LexiconChecker.fromFile(args.rules)
+    ruleIndices = None
+    if args.candidates:
+        with open(args.candidates, encoding='utf-8') as f:
+            lines = [line.strip() for line in f if line.strip() and not line.lstrip().startswith(';')]
+        checker, ruleIndices = checker.withCandidates(lines)
+
+    collisions = checker.collisions(LexiconChecker.readLexicon(args.lexicon), ruleIndices)
+    for idx in sorted(collisions):
+        words = ', '.join(f'{word} -> {newText}' for word, newText in collisions[idx])
+        print(f'{checker.ruleSet[idx].line}: {words}')
+
+    print(f'rules which corrupt words: {len(collisions)}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import collections
+import time
+from RuleSet import RuleSet, RuleSetProxy
+
+# Bounded cache in front of RuleSet.find(), keyed by (word, hasEndChar). Real text repeats
+# the same identifiers and words constantly, so most lookups become one dict probe.
+# Pass it anywhere a RuleSet is used, ex: Corrector(LookupCache(ruleSet), endChars).
+#
+# Eviction is 'lru' (least recently used) or 'fifo' (oldest insert, cheaper on hits).
+# A cache made with fromFile() checks at most every checkInterval seconds whether the
+# file was reloaded by RuleSet.fromFile() and then starts over with the new rules.
+class LookupCache(RuleSetProxy):
+    policies = ['lru', 'fifo']
+
+    def __init__(self, ruleSet: RuleSet, maxSize=4096, policy='lru'):
+        assert maxSize > 0, 'maxSize must be positive'
+        assert policy in LookupCache.policies, f'unknown eviction policy: {policy}'
+
+        self.maxSize = maxSize
+        self.policy = policy
+        self.file = None
+        self.checkInterval = None
+        self.lastCheck = 0.0
+        self.cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._setRuleSet(ruleSet)
+
+    @staticmethod
+    def fromFile(file, maxSize=4096, policy='lru', checkInterval=1.0):
+        cache = LookupCache(RuleSet.fromFile(file), maxSize, policy)
+        cache.file = file
+        cache.checkInterval = checkInterval
+        cache.lastCheck = time.monotonic()
+        return cache
+
+    def _setRuleSet(self, ruleSet):
+        self.ruleSet = ruleSet
+        self.rules = ruleSet.rules
+        self.clear()
+
+    # drops every cached lookup, statistics are kept
+    def clear(self):
+        self.cache.clear()
+
+    # reloads the file (see RuleSet.fromFile) and clears the cache when the rules changed
+    def reload(self):
+        self.lastCheck = time.monotonic()
+        ruleSet = RuleSet.fromFile(self.file)
+        if ruleSet is not self.ruleSet:
+            self._setRuleSet(ruleSet)
+
+    def find(self, word: str, hasEndChar: bool):
+        if self.file is not None and time.monotonic() - self.lastCheck > self.checkInterval:
+            self.reload()
+
+        key = (word, hasEndChar)
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            if self.policy == 'lru':
+                self.cache.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self.ruleSet.find(word, hasEndChar)
+        self.cache[key] = result
+        if len(self.cache) > self.maxSize:
+            # least recently used (lru) or oldest (fifo) entry
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+        return result
+
+    def hitRate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    # returns the statistics as a JSON compatible dict
+    def stats(self):
+        return {
+            'size': len(self.cache),
+            'maxSize': self.maxSize,
+            'policy': self.policy,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hitRate': self.hitRate(),
+        }
@@ -1,61 +1,131 @@
+import io
 import pathlib
 import re
+import sys
 
 class Rule:
     yamlIndent = '    '
 
-    def __init__(self, line, backspace, caseSensitive, suffixMatch, prefixMatch):
+    # first unescaped '::', which separates old text from new text
+    splitterRegex = re.compile(r'(?<!`)::')
+
+    # a char between '{' and '}' is escaped, ex: '{{}'
+    braceEscapeRegex = re.compile(r'{(.)}')
+
+    # rules are kept compact because several rule files may be loaded at once:
+    # no per-instance dict, the four options packed into one int, and interned strings
+    __slots__ = ('line', 'flags', 'oldText', 'oldTextLower', 'newText')
+
+    # bits of flags
+    backspaceFlag = 1
+    caseSensitiveFlag = 2
+    suffixMatchFlag = 4
+    prefixMatchFlag = 8
+    affixMatchFlags = suffixMatchFlag | prefixMatchFlag
+
+    def __init__(self, line, backspace, caseSensitive, suffixMatch, prefixMatch, oldText=None, newText=None):
         self.line = line
-        self.backspace = backspace
-        self.caseSensitive = caseSensitive
-        self.suffixMatch = suffixMatch
-        self.prefixMatch = prefixMatch
+        self.flags = ((Rule.backspaceFlag if backspace else 0) | (Rule.caseSensitiveFlag if caseSensitive else 0) |
+                      (Rule.suffixMatchFlag if suffixMatch else 0) | (Rule.prefixMatchFlag if prefixMatch else 0))
+
+        if oldText is None or newText is None:
+            _, oldText, newText = Rule.splitLine(line)
+
+        # many rules share text, ex: the newText of suffix rules
+        self.oldText = sys.intern(oldText)
+        oldTextLower = oldText.lower() # lower() is slow to call in a loop, so do it once here
+        self.oldTextLower = self.oldText if oldTextLower == oldText else sys.intern(oldTextLower)
+        self.newText = sys.intern(newText)
+
+    @property
+    def backspace(self):
+        return bool(self.flags & Rule.backspaceFlag)
 
-        self.oldText = Rule.getOldText(line)
-        self.oldTextLower = self.oldText.lower() # lower() is slow to call in a loop, so do it once here
-        self.newText = Rule.getNewText(line)
+    @property
+    def caseSensitive(self):
+        return bool(self.flags & Rule.caseSensitiveFlag)
+
+    @property
+    def suffixMatch(self):
+        return bool(self.flags & Rule.suffixMatchFlag)
+
+    @property
+    def prefixMatch(self):
+        return bool(self.flags & Rule.prefixMatchFlag)
 
     # loads AHK file and returns list of Rules
     @staticmethod
     def fileToRuleList(file):
-        lines = Rule.cleanFile(file)
+        return list(Rule.iterRules(file))
 
-        rules = [Rule.lineToRule(line) for line in lines]
-        return rules
+    # yields one Rule per rule line in the AHK file
+    @staticmethod
+    def iterRules(file):
+        for line in Rule.iterLines(file):
+            yield Rule.lineToRule(line)
 
     # Converts AHK file into a list of rules
     # Removes leading/trailing whitespace, comments, directives, and more.
     @staticmethod
     def cleanFile(file):
+        return list(Rule.iterLines(file))
+
+    # Reads the AHK file one line at a time and yields each rule line, ex: "::old::new"
+    # Each line is cleaned in a single pass, see cleanFile()
+    @staticmethod
+    def iterLines(file):
         file = Rule.getRelativeFileName(file)
+        count = 0
 
-        # read file (removing trailing whitespace)
         with open(file, encoding='utf-8') as f:
-            lines = [line.strip() for line in f]
+            for line in f:
+                # remove leading/trailing whitespace
+                line = line.strip()
 
-        # remove empty lines
-        lines = [line for line in lines if len(line) > 0]
+                # skip empty lines, empty '{' and '}' scope, directives, and leading comments
+                if not line or line in {'{', '}'} or line[0] in '#;':
+                    continue
 
-        # remove empty '{' and '}' scope
-        lines = [line for line in lines if line not in {'{', '}'}]
+                # remove trailing comments and the whitespace before them
+                line = line.split(' ;')[0].strip()
 
-        # remove directives
-        lines = [line for line in lines if not line.startswith('#')]
+                # lines are now of form: "::old::new"
+                assert line.startswith(':')
 
-        # remove leading comments
-        lines = [line for line in lines if not line.startswith(';')]
+                count += 1
+                yield line
 
-        # remove trailing comments
-        lines = [line.split(' ;')[0] for line in lines]
+        assert count > 0
 
-        # remove trailing whitespace introduced from previous step
-        lines = [line.strip() for line in lines]
+    # returns the set of ending characters from the '#Hotstring EndChars' directive
+    # ex: '#Hotstring EndChars -()`n `t' returns {'-', '(', ')', '\n', ' ', '\t'}
+    @staticmethod
+    def getEndChars(file):
+        file = Rule.getRelativeFileName(file)
+        directive = '#Hotstring EndChars '
+
+        with open(file, encoding='utf-8') as f:
+            lines = [line.strip('\n') for line in f if line.startswith(directive)]
+
+        assert len(lines) == 1
+        return set(Rule.unescapeAhk(lines[0][len(directive):]))
+
+    # converts AHK escape sequences, ex: '`n' => newline, '``' => '`'
+    @staticmethod
+    def unescapeAhk(text: str):
+        escapes = {'n': '\n', 't': '\t', 'r': '\r', 's': ' '}
+        chars = []
+        idx = 0
+        while idx < len(text):
+            char = text[idx]
+            if char == '`' and idx + 1 < len(text):
+                idx += 1
+                char = escapes.get(text[idx], text[idx])
 
-        # lines are now of form: "::old::new"
-        assert all(line.startswith(':') for line in lines)
+            chars.append(char)
+            idx += 1
 
-        assert len(lines) > 0
-        return lines
+        return ''.join(chars)
 
     @staticmethod
     def getRelativeFileName(file):
@@ -68,15 +138,32 @@ class Rule:
     # creates Rule instance from one line of text
     @staticmethod
     def lineToRule(line: str):
-        optionsText = Rule.getOptionsText(line)
+        optionsText, oldText, newText = Rule.splitLine(line)
         backspace = 'b0' in optionsText
         caseSensitive = 'C' in optionsText
         suffixMatch = '?' in optionsText
         prefixMatch = '*' in optionsText
 
-        rule = Rule(line, backspace, caseSensitive, suffixMatch, prefixMatch)
+        rule = Rule(line, backspace, caseSensitive, suffixMatch, prefixMatch, oldText, newText)
         return rule
 
+    # splits a line into its options, old text, and new text in one scan
+    # ex: returns (':C*:', 'yz', '123') from ':C*:yz::123'
+    @staticmethod
+    def splitLine(line: str):
+        optsText = Rule.getOptionsText(line)
+
+        # ex: convert '::abc::def' to 'abc::def'
+        noOpts = line[len(optsText):]
+
+        # find first unescaped '::'
+        splitter = Rule.splitterRegex.search(noOpts).start()
+        assert splitter > 0
+
+        oldText = Rule.unescapeText(noOpts[0:splitter])
+        newText = Rule.unescapeText(noOpts[splitter + len('::'):])
+        return optsText, oldText, newText
+
     # ex: returns ':b0:' from ':b0:movie::'
     @staticmethod
     def getOptionsText(line: str):
@@ -101,8 +188,7 @@ class Rule:
         noOpts = line[len(optsText):]
 
         # find first unescaped '::'
-        out = re.search(r'(?<!`)::', noOpts)
-        splitter = out.regs[0][0]
+        splitter = Rule.splitterRegex.search(noOpts).start()
         assert splitter > 0
 
         oldText = noOpts[0:splitter]
@@ -114,15 +200,7 @@ class Rule:
     # ex: returns 'def' form '::abc::def'
     @staticmethod
     def getNewText(line: str):
-        optsText = Rule.getOptionsText(line)
-
-        # using line length to get new text, so do not escape
-        # anything (yet) because it changes the string length
-        oldText = Rule.getOldText(line, False)
-        splitter = '::'
-        newText = line[len(oldText) + len(optsText) + len(splitter) :]
-
-        newText = Rule.unescapeText(newText)
+        _, _, newText = Rule.splitLine(line)
         return newText
 
     # this is a naive function which doesn't check the context of the
@@ -137,7 +215,7 @@ class Rule:
         newText = newText.strip('`')
 
         # a char between '{' and '}' is escaped, ex: convert '{{}' to '{'
-        newText = re.sub(r'{(.)}', r'\1', newText)
+        newText = Rule.braceEscapeRegex.sub(r'\1', newText)
         return newText
 
     # ex: inputText = 'Wriet-Output'
@@ -166,7 +244,65 @@ class Rule:
 
         return replacedText
 
-    # iterates through rules trying to find a match
+    # AHK's default case conformity: an abbreviation typed in all caps sends the replacement
+    # in all caps, and a capitalized abbreviation capitalizes the first letter of the replacement
+    @staticmethod
+    def conformCase(typed: str, newText: str):
+        letters = [char for char in typed if char.isalpha()]
+        if len(letters) > 1 and all(char.isupper() for char in letters):
+            return newText.upper()
+
+        if letters and typed[0].isupper():
+            return newText[:1].upper() + newText[1:]
+
+        return newText
+
+    # returns the replacement text if this one rule fires for inputText, otherwise None
+    @staticmethod
+    def matchRule(rule, inputText: str, inputTextLower: str, hasEndChar: bool):
+        # read the packed options once; this is the hot loop of the linear scan
+        flags = rule.flags
+        if flags & Rule.caseSensitiveFlag:
+            lhs = rule.oldText
+            rhs = inputText
+        else:
+            lhs = rule.oldTextLower
+            rhs = inputTextLower
+
+        if lhs == rhs:
+            # exact match
+            if flags & Rule.backspaceFlag:
+                # otherwise, return text unchanged
+                return inputText
+
+            if hasEndChar:
+                # found match
+                return rule.newText
+
+        if not flags & Rule.affixMatchFlags:
+            # most rules are neither prefix nor suffix rules
+            return None
+
+        if flags & Rule.prefixMatchFlag:
+            # prefix rules, :*:, only need to start with text
+            # (ending char does not matter)
+            # ex: :*:grahp should match "graphing"
+            if rhs.startswith(rule.oldText):
+                return Rule._replacePreserveCase(inputText, rule.oldText, rule.newText)
+
+        if flags & Rule.suffixMatchFlag:
+            # suffix matches
+            if hasEndChar and inputText.endswith(rule.oldText):
+                if flags & Rule.backspaceFlag:
+                    # found whitelist match, return text unchanged
+                    return inputText
+
+                return rule.newText
+
+        return None
+
+    # iterates through rules trying to find a match. RuleSet.lookup gives the same
+    # result using indexes; this linear scan is kept as the reference implementation
     @staticmethod
     def getReplacementText(rules: list, inputText: str, hasEndChar: bool, startIdx = 0):
         # startIdx is an optimization to allow the next test to start where the previous left off.
@@ -176,55 +312,45 @@ class Rule:
         inputTextLower = inputText.lower() # lower() is slow to call in a loop, so do it once here
         for idx in range(startIdx, len(rules)):
             rule = rules[idx]
-            if rule.caseSensitive:
-                lhs = rule.oldText
-                rhs = inputText
-            else:
-                lhs = rule.oldTextLower
-                rhs = inputTextLower
-
-            if lhs == rhs:
-                # exact match
-                if rule.backspace:
-                    # otherwise, return text unchanged
-                    return inputText, rule, idx
-
-                if hasEndChar:
-                    # found match
-                    return rule.newText, rule, idx
-
-            if rule.prefixMatch:
-                # prefix rules, :*:, only need to start with text
-                # (ending char does not matter)
-                # ex: :*:grahp should match "graphing"
-                if rhs.startswith(rule.oldText):
-                    replacedText = Rule._replacePreserveCase(inputText, rule.oldText, rule.newText)
-                    return replacedText, rule, idx
-
-            if rule.suffixMatch:
-                # suffix matches
-                if hasEndChar and inputText.endswith(rule.oldText):
-                    if rule.backspace:
-                        # found whitelist match, return text unchanged
-                        return inputText, rule, idx
-
-                    return rule.newText, rule, idx
+            replacedText = Rule.matchRule(rule, inputText, inputTextLower, hasEndChar)
+            if replacedText is not None:
+                return replacedText, rule, idx
 
         # no match found, return input text
         return inputText, None, 0
 
+    espansoPreamble = ('---\n# Auto-generated Espanso YAML file\n'
+                       '# https://github.com/tnear/AutocorrectForDevelopers\n'
+                       'matches:\n')
+
     @staticmethod
     def convertToEspanso(rules):
-        yaml = '---\n# Auto-generated Espanso YAML file\n'
-        yaml += '# https://github.com/tnear/AutocorrectForDevelopers\n'
-        yaml += 'matches:\n'
-        for rule in rules:
-            yaml += Rule.convertOneRuleToEspanso(rule)
+        stream = io.StringIO()
+        Rule.writeEspanso(rules, stream)
+        return stream.getvalue()
 
-        return yaml
+    # writes the Espanso YAML for rules to any writable text stream, one rule at a time
+    @staticmethod
+    def writeEspanso(rules, stream):
+        stream.write(Rule.espansoPreamble)
+        for rule in rules:
+            stream.write(Rule.convertOneRuleToEspanso(rule))
 
     @staticmethod
     def convertOneRuleToEspanso(rule):
+        yaml = [Rule.espansoTrigger(rule)]
+        if not yaml[0]:
+            return ''
+
+        for option in Rule.espansoOptions(rule):
+            yaml.append(f'{Rule.yamlIndent}{option}: true\n')
+
+        yaml.append('\n')
+        return ''.join(yaml)
+
+    # returns the trigger and replace lines of a rule's Espanso match, or '' when it is skipped
+    @staticmethod
+    def espansoTrigger(rule):
         newText = rule.newText
         if '`n' in rule.oldText:
             # ahk newlines in trigger are not supported by espanso, so skip them
@@ -239,18 +365,20 @@ class Rule:
             # double quotes must be escaped with \ in yaml
             oldText = oldText.replace('"', '\\"')
 
-        yaml = f'  - trigger: "{oldText}"\n'
-        yaml = yaml + Rule.yamlIndent + f'replace: "{newText}"\n'
+        return f'  - trigger: "{oldText}"\n{Rule.yamlIndent}replace: "{newText}"\n'
+
+    # returns the names of the boolean Espanso options of a rule, ex: ['word', 'propagate_case']
+    @staticmethod
+    def espansoOptions(rule):
         if rule.prefixMatch:
-            yaml = yaml + Rule.yamlIndent + 'left_word: true\n'
+            options = ['left_word']
         elif rule.suffixMatch:
-            yaml = yaml + Rule.yamlIndent + 'right_word: true\n'
+            options = ['right_word']
         else:
-            yaml = yaml + Rule.yamlIndent + 'word: true\n'
+            options = ['word']
 
         if not rule.caseSensitive:
             # autocorrect regardless of case
-            yaml = yaml + Rule.yamlIndent + 'propagate_case: true\n'
+            options.append('propagate_case')
 
-        yaml += '\n'
-        return yaml
+        return options
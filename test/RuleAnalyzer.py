@@ -0,0 +1,108 @@
+import argparse
+import collections
+import sys
+from Rule import Rule
+from RuleSet import RuleSet
+
+# a rule which no witness reaches. winners are the indices of the earlier rules which take
+# its witnesses, empty when the rule cannot match any input at all. certain is False when
+# a casing which was not tried might still reach the rule, see RuleAnalyzer
+DeadRule = collections.namedtuple('DeadRule', ['idx', 'rule', 'winners', 'certain'])
+
+# Finds rules which can never fire because earlier rules (in file order) always match first,
+# ex: ':*:grahp::graph' makes a later '::grahping::graphing' dead. For every rule, a few
+# witness inputs are looked up through the RuleSet indexes. Witnesses are built so that
+# only rules which match every input of the rule can beat them:
+#   - prefix rules are extended, and suffix rules prefixed, with a char which no trigger
+#     contains, so exact rules and longer prefix or suffix rules cannot match the witness
+#   - case insensitive rules are tried in a few casings (as written, lower, upper, capitalized
+#     and swapped), so one ':C:' rule cannot hide them
+#   - rules are tried with and without an ending char
+# A rule is reachable when one of its witnesses finds it. Otherwise it is certainly dead when
+# it is case sensitive, or when every winner matches all casings (case insensitive exact and
+# prefix rules). Other case insensitive rules may still be reached by a casing which was not
+# tried, ex: 'tEh' after ':C:' rules for 'teh', 'TEH', 'Teh' and 'tEH', so they are only
+# reported as possibly shadowed.
+class RuleAnalyzer:
+    # the first of these which is in no trigger fills out the witnesses
+    fillerCandidates = '~^$%0123456789zqxj\0'
+
+    def __init__(self, ruleSet: RuleSet):
+        self.ruleSet = ruleSet
+        triggerChars = set(''.join(rule.oldText for rule in ruleSet))
+        self.filler = next(char for char in RuleAnalyzer.fillerCandidates if char not in triggerChars)
+
+    @staticmethod
+    def fromFile(file):
+        return RuleAnalyzer(RuleSet.fromFile(file))
+
+    # returns [(word, hasEndChar)] to try for a rule
+    def witnesses(self, rule):
+        if rule.caseSensitive:
+            variants = [rule.oldText]
+        else:
+            text = rule.oldText
+            variants = list(dict.fromkeys([text, text.lower(), text.upper(), text.capitalize(), text.swapcase()]))
+
+        witnesses = []
+        for variant in variants:
+            witnesses.extend([(variant, True), (variant, False)])
+            if rule.prefixMatch:
+                witnesses.extend([(variant + self.filler, True), (variant + self.filler, False)])
+            if rule.suffixMatch:
+                witnesses.append((self.filler + variant, True))
+
+        return witnesses
+
+    # returns the first witness (word, hasEndChar) for which rules[idx] fires, or None
+    def reachingInput(self, idx):
+        for word, hasEndChar in self.witnesses(self.ruleSet[idx]):
+            if self.ruleSet.find(word, hasEndChar)[1] == idx:
+                return word, hasEndChar
+
+        return None
+
+    # true when rule matches every casing of an input it matches. suffixes compare case sensitive
+    @staticmethod
+    def matchesAllCasings(rule):
+        return not rule.caseSensitive and not rule.suffixMatch
+
+    # returns a DeadRule for every rule which no witness reaches
+    def deadRules(self):
+        deadRules = []
+        for idx, rule in enumerate(self.ruleSet):
+            if self.reachingInput(idx) is not None:
+                continue
+
+            # the earlier rules which win the witnesses that this rule matches
+            winners = set()
+            for word, hasEndChar in self.witnesses(rule):
+                if Rule.matchRule(rule, word, word.lower(), hasEndChar) is not None:
+                    winners.add(self.ruleSet.find(word, hasEndChar)[1])
+
+            certain = rule.caseSensitive or all(RuleAnalyzer.matchesAllCasings(self.ruleSet[winner]) for winner in winners)
+            deadRules.append(DeadRule(idx, rule, sorted(winners), certain))
+
+        return deadRules
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find AutocorrectForDevelopers rules which can never fire.')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    args = parser.parse_args(argv)
+
+    analyzer = RuleAnalyzer.fromFile(args.rules)
+    deadRules = analyzer.deadRules()
+    for deadRule in deadRules:
+        if deadRule.winners:
+            winners = ', '.join(analyzer.ruleSet[idx].line for idx in deadRule.winners)
+            shadowed = 'is shadowed' if deadRule.certain else 'is possibly shadowed'
+            print(f'{deadRule.rule.line} {shadowed} by {winners}')
+        else:
+            print(f'{deadRule.rule.line} never matches')
+
+    dead = sum(deadRule.certain for deadRule in deadRules)
+    print(f'dead rules: {dead} of {len(analyzer.ruleSet)}, possibly shadowed: {len(deadRules) - dead}')
+    return 1 if deadRules else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
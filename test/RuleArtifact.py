@@ -0,0 +1,322 @@
+import argparse
+import array
+import bisect
+import collections
+import hashlib
+import mmap
+import sys
+import zlib
+from Rule import Rule
+from RuleSet import RuleSet
+
+# the fields of a Rule which Rule.matchRule uses, read straight from the artifact
+RuleView = collections.namedtuple('RuleView', ['flags', 'oldText', 'oldTextLower', 'newText'])
+
+# Compiled, memory-mappable form of an AHK rules file. lookup() gives the same results as
+# RuleSet.lookup(), but answers straight from the mapped file without parsing the script
+# or building Rule objects, so short-lived processes start instantly and share one copy
+# of the artifact through the page cache.
+#
+# The file is an array of little-endian uint32 words followed by a UTF-8 string table:
+#   header:  magic, version, ruleCount, stringsOffset (bytes), stringsSize,
+#            8 words of the source file's sha256, then (offset, size) in words of each table
+#   rules:   9 words per rule: Rule.flags, then (offset, length) of oldText, oldTextLower, newText, line
+#   exact:   capacity, then 4 words per slot: keyOffset, keyLength, idxWithEndChar + 1, idxWithoutEndChar + 1
+#            (open addressing on crc32 of the key, 0 = no rule)
+#   tries:   nodeCount, 3 words per node: firstEdge, edgeCount, first rule idx + 1,
+#            then edgeCount, edge chars (sorted per node), edge children
+class RuleArtifact:
+    magic = int.from_bytes(b'AFDR', 'little')
+    version = 1
+    headerSize = 13
+
+    # order of the tables after the header
+    tables = ['rules', 'exactIndex', 'exactIndexLower', 'prefixTrie', 'prefixTrieLower', 'suffixTrie']
+
+    def __init__(self, file):
+        with open(file, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # every memoryview into the mmap must be released before it is closed
+        self._views = []
+        if sys.byteorder == 'little':
+            self.words = self._view(memoryview(self.mmap)[:len(self.mmap) // 4 * 4].cast('I'))
+        else:
+            # the artifact is little-endian, so big-endian machines need a swapped copy
+            self.words = array.array('I', self.mmap[:len(self.mmap) // 4 * 4])
+            self.words.byteswap()
+
+        assert self.words[0] == RuleArtifact.magic, f'{file} is not a rule artifact'
+        assert self.words[1] == RuleArtifact.version, f'{file} has an unsupported version'
+
+        self.ruleCount = self.words[2]
+        self.stringsOffset = self.words[3]
+        self.sourceHash = self.mmap[20:52].hex()
+
+        offsets = {}
+        for idx, name in enumerate(RuleArtifact.tables):
+            offsets[name] = self.words[RuleArtifact.headerSize + 2 * idx]
+
+        self.rulesOffset = offsets['rules']
+        self.exactIndex = offsets['exactIndex']
+        self.exactIndexLower = offsets['exactIndexLower']
+        self.prefixTrie = self._trie(offsets['prefixTrie'])
+        self.prefixTrieLower = self._trie(offsets['prefixTrieLower'])
+        self.suffixTrie = self._trie(offsets['suffixTrie'])
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+
+        self._views = []
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.ruleCount
+
+    # true when the artifact was not compiled from the current contents of the AHK file
+    def isStale(self, file):
+        return self.sourceHash != RuleArtifact._fileHash(file)
+
+    # returns (newText, idx) exactly like RuleSet.find()
+    def find(self, word: str, hasEndChar: bool):
+        wordLower = word.lower()
+        endCharPos = 2 if hasEndChar else 3
+
+        candidates = [
+            self._exactMatch(self.exactIndex, word, endCharPos),
+            self._exactMatch(self.exactIndexLower, wordLower, endCharPos),
+            self._trieMatch(self.prefixTrie, word),
+            self._trieMatch(self.prefixTrieLower, wordLower),
+        ]
+        if hasEndChar:
+            candidates.append(self._trieMatch(self.suffixTrie, reversed(word)))
+
+        candidates = [idx for idx in candidates if idx is not None]
+        if not candidates:
+            # no match found, return input text
+            return word, None
+
+        idx = min(candidates)
+        newText = Rule.matchRule(self.ruleView(idx), word, wordLower, hasEndChar)
+        return newText, idx
+
+    # returns (newText, rule) like RuleSet.lookup(). The Rule is only built for the match
+    def lookup(self, word: str, hasEndChar: bool):
+        newText, idx = self.find(word, hasEndChar)
+        if idx is None:
+            return newText, None
+
+        return newText, self.rule(idx)
+
+    def rule(self, idx):
+        return Rule.lineToRule(self._ruleString(idx, 7))
+
+    def ruleView(self, idx):
+        return RuleView(self.words[self.rulesOffset + 9 * idx],
+                        self._ruleString(idx, 1), self._ruleString(idx, 3), self._ruleString(idx, 5))
+
+    def _ruleString(self, idx, field):
+        pos = self.rulesOffset + 9 * idx + field
+        return self._string(self.words[pos], self.words[pos + 1])
+
+    def _string(self, offset, length):
+        start = self.stringsOffset + offset
+        return self.mmap[start:start + length].decode('utf-8')
+
+    def _exactMatch(self, table, key, endCharPos):
+        keyBytes = key.encode('utf-8')
+        capacity = self.words[table]
+        slot = zlib.crc32(keyBytes) & (capacity - 1)
+        while True:
+            pos = table + 1 + 4 * slot
+            keyLength = self.words[pos + 1]
+            if keyLength == 0:
+                return None
+
+            if keyLength == len(keyBytes):
+                start = self.stringsOffset + self.words[pos]
+                if self.mmap[start:start + keyLength] == keyBytes:
+                    value = self.words[pos + endCharPos]
+                    return value - 1 if value else None
+
+            slot = (slot + 1) & (capacity - 1)
+
+    # returns the views of one trie: (nodes, edgeChars, edgeChildren)
+    def _trie(self, offset):
+        nodeCount = self.words[offset]
+        nodes = self._view(self.words[offset + 1 : offset + 1 + 3 * nodeCount])
+        edgeOffset = offset + 1 + 3 * nodeCount
+        edgeCount = self.words[edgeOffset]
+        edgeChars = self._view(self.words[edgeOffset + 1 : edgeOffset + 1 + edgeCount])
+        edgeChildren = self._view(self.words[edgeOffset + 1 + edgeCount : edgeOffset + 1 + 2 * edgeCount])
+        return nodes, edgeChars, edgeChildren
+
+    def _view(self, words):
+        if isinstance(words, memoryview):
+            self._views.append(words)
+
+        return words
+
+    # walks text from the root and returns the first (in file order) rule on the path
+    def _trieMatch(self, trie, text):
+        nodes, edgeChars, edgeChildren = trie
+        node = 0
+        best = None
+        for char in text:
+            firstEdge = nodes[3 * node]
+            lastEdge = firstEdge + nodes[3 * node + 1]
+            code = ord(char)
+            edge = bisect.bisect_left(edgeChars, code, firstEdge, lastEdge)
+            if edge == lastEdge or edgeChars[edge] != code:
+                break
+
+            node = edgeChildren[edge]
+            value = nodes[3 * node + 2]
+            if value and (best is None or value - 1 < best):
+                best = value - 1
+
+        return best
+
+    # compiles an AHK file into an artifact file
+    @staticmethod
+    def compile(ahkFile, artifactFile):
+        ruleSet = RuleSet.fromFile(ahkFile)
+        strings = StringTable()
+        tables = {}
+
+        rules = array.array('I')
+        for rule in ruleSet:
+            rules.append(rule.flags)
+            for text in [rule.oldText, rule.oldTextLower, rule.newText, rule.line]:
+                rules.extend(strings.add(text))
+        tables['rules'] = rules
+
+        tables['exactIndex'] = RuleArtifact._compileHashTable(ruleSet.exactIndex, strings)
+        tables['exactIndexLower'] = RuleArtifact._compileHashTable(ruleSet.exactIndexLower, strings)
+        tables['prefixTrie'] = RuleArtifact._compileTrie(ruleSet.prefixTrie)
+        tables['prefixTrieLower'] = RuleArtifact._compileTrie(ruleSet.prefixTrieLower)
+        tables['suffixTrie'] = RuleArtifact._compileTrie(ruleSet.suffixTrie)
+
+        # the source hash (words 5 to 12) is written as raw bytes below
+        header = array.array('I', [RuleArtifact.magic, RuleArtifact.version, len(ruleSet), 0, 0] + [0] * 8)
+        offset = RuleArtifact.headerSize + 2 * len(RuleArtifact.tables)
+        for name in RuleArtifact.tables:
+            header.extend([offset, len(tables[name])])
+            offset += len(tables[name])
+
+        stringBytes = strings.tobytes()
+        header[3] = 4 * offset
+        header[4] = len(stringBytes)
+
+        words = header
+        for name in RuleArtifact.tables:
+            words.extend(tables[name])
+        if sys.byteorder != 'little':
+            words.byteswap()
+
+        data = bytearray(words.tobytes())
+        data[20:52] = bytes.fromhex(RuleArtifact._fileHash(ahkFile))
+        with open(artifactFile, 'wb') as f:
+            f.write(data)
+            f.write(stringBytes)
+
+    @staticmethod
+    def _compileHashTable(index, strings):
+        capacity = 1
+        while capacity < 2 * len(index):
+            capacity *= 2
+
+        slots = [None] * capacity
+        for key, (idxWithEndChar, idxWithoutEndChar) in index.items():
+            keyBytes = key.encode('utf-8')
+            slot = zlib.crc32(keyBytes) & (capacity - 1)
+            while slots[slot] is not None:
+                slot = (slot + 1) & (capacity - 1)
+
+            slots[slot] = strings.add(key) + [RuleArtifact._plusOne(idxWithEndChar), RuleArtifact._plusOne(idxWithoutEndChar)]
+
+        table = array.array('I', [capacity])
+        for slot in slots:
+            table.extend(slot if slot is not None else [0, 0, 0, 0])
+
+        return table
+
+    @staticmethod
+    def _compileTrie(trie):
+        # number the nodes breadth first, so every node's edges are contiguous
+        nodes = [trie.root]
+        edges = []
+        nodeWords = array.array('I')
+        for node in nodes:
+            children = sorted(node.children.items())
+            nodeWords.extend([len(edges), len(children), RuleArtifact._plusOne(min(node.values, default=None))])
+            for char, child in children:
+                edges.append((ord(char), len(nodes)))
+                nodes.append(child)
+
+        table = array.array('I', [len(nodes)])
+        table.extend(nodeWords)
+        table.append(len(edges))
+        table.extend(char for char, _ in edges)
+        table.extend(child for _, child in edges)
+        return table
+
+    @staticmethod
+    def _plusOne(idx):
+        return 0 if idx is None else idx + 1
+
+    @staticmethod
+    def _fileHash(file):
+        with open(Rule.getRelativeFileName(file), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+# UTF-8 string table which stores each distinct string once
+class StringTable:
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = {}
+
+    # returns [offset, length] of text in the table
+    def add(self, text):
+        encoded = text.encode('utf-8')
+        offset = self.offsets.get(encoded)
+        if offset is None:
+            offset = len(self.data)
+            self.offsets[encoded] = offset
+            self.data += encoded
+
+        return [offset, len(encoded)]
+
+    def tobytes(self):
+        return bytes(self.data)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile AutocorrectForDevelopers rules into a memory-mapped artifact.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compileParser = subparsers.add_parser('compile', help='compile the AHK file')
+    compileParser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    compileParser.add_argument('-o', '--output', default='AutocorrectForDevelopers.rules', help='artifact file')
+
+    lookupParser = subparsers.add_parser('lookup', help='look up words in an artifact')
+    lookupParser.add_argument('artifact', help='artifact file')
+    lookupParser.add_argument('words', nargs='+')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        RuleArtifact.compile(args.rules, args.output)
+    else:
+        with RuleArtifact(args.artifact) as artifact:
+            for word in args.words:
+                newText, _ = artifact.lookup(word, True)
+                print(f'{word} -> {newText}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import collections
+import sys
+from RuleSet import RuleSet
+from Trie import Trie
+
+# one failed consistency check, ex: Violation('redundantSuffix', 'Found redundant suffix rule: ...')
+Violation = collections.namedtuple('Violation', ['check', 'message'])
+
+# Consistency checks over the rule families which used to be nested loops in the tests.
+# Suffix triggers are kept in a reversed trie and prefix triggers in a trie, so every
+# check walks each string once instead of comparing every pair. Each check returns all
+# of its violations, not just the first.
+class RuleLinter:
+    def __init__(self, ruleSet: RuleSet):
+        # note: backspace rules are ignored because they are whitelists
+        suffixRules = [rule for rule in ruleSet if rule.suffixMatch and not rule.backspace]
+        self.suffixes = [rule.oldText for rule in suffixRules]
+        self.suffixRules = {rule.oldText: rule.newText for rule in suffixRules}
+
+        self.prefixes = [rule.oldText for rule in ruleSet if rule.prefixMatch]
+
+        exactRules = [rule for rule in ruleSet if not rule.prefixMatch and not rule.suffixMatch and
+                      not rule.backspace and not rule.caseSensitive]
+        self.exactRules = {rule.oldText: rule.newText for rule in exactRules}
+
+        # values are indices into self.suffixes
+        self.suffixTrie = Trie(reverse=True)
+        for idx, suffix in enumerate(self.suffixes):
+            self.suffixTrie.insert(suffix, idx)
+
+    @staticmethod
+    def fromFile(file):
+        return RuleLinter(RuleSet.fromFile(file))
+
+    # returns every violation of every check. the test lists are the keys of EXPLICIT_TESTS
+    # in testMatchSuffix.py and testMatchPrefix.py
+    def lint(self, suffixTests=(), prefixTests=()):
+        violations = [Violation('redundantSuffix', message) for message in self.redundantSuffixes()]
+        violations.extend(Violation('redundantExactMatch', message) for message in self.redundantExactRules())
+        violations.extend(Violation('untestedSuffix', message) for message in self.untestedSuffixes(suffixTests))
+        violations.extend(Violation('untestedPrefix', message) for message in self.untestedPrefixes(prefixTests))
+        return violations
+
+    # no suffix should end with another suffix
+    # ex: a suffix rule for '-paegs=>-pages' is unnecessary if there is already a rule for '-aegs=>-ages'
+    def redundantSuffixes(self):
+        messages = []
+        for idx, suffix in enumerate(self.suffixes):
+            for other in self.suffixTrie.iterMatches(suffix):
+                if other != idx:
+                    messages.append(f'Found redundant suffix rule: "{self.suffixes[other]}" in "{suffix}"')
+
+        return messages
+
+    # there is no need for a regular rule which is already encompassed by a suffix rule.
+    # ex: the rule 'exectues::executes' is unnecessary with this suffix rule ':?:tues::utes'
+    def redundantExactRules(self):
+        messages = []
+        for oldTextExact, newTextExact in self.exactRules.items():
+            for idx in self.suffixTrie.iterMatches(oldTextExact):
+                oldText = self.suffixes[idx]
+                if newTextExact.endswith(self.suffixRules[oldText]):
+                    messages.append(f'Redundant exact match: "{oldTextExact}" not needed due to suffix "-{oldText}"')
+
+        return messages
+
+    # every suffix rule needs a test which ends with it
+    def untestedSuffixes(self, tests):
+        testTrie = RuleLinter._trie(tests, reverse=True)
+        return [f'The suffix "{suffix}" does not have an automated test'
+                for suffix in self.suffixes if not testTrie.isPrefixOfKey(suffix)]
+
+    # every prefix rule needs a test which starts with it
+    def untestedPrefixes(self, tests):
+        testTrie = RuleLinter._trie(tests)
+        return [f'The prefix "{prefix}" does not have an automated test'
+                for prefix in self.prefixes if not testTrie.isPrefixOfKey(prefix)]
+
+    # returns the words which are the end of another word, shortest first
+    # ex: ['abel', 'label', 'x'] returns ['abel'] because "label" ends with "abel"
+    @staticmethod
+    def suffixesWithWords(words):
+        trie = RuleLinter._trie(words, reverse=True)
+        found = set()
+        for idx, word in enumerate(words):
+            found.update(other for other in trie.iterMatches(word) if other != idx)
+
+        return sorted((words[idx] for idx in sorted(found)), key=len)
+
+    # returns the words which neither are nor end with any of suffixes, in order
+    @staticmethod
+    def wordsWithoutSuffixes(words, suffixes):
+        trie = RuleLinter._trie(suffixes, reverse=True)
+        return [word for word in words if next(trie.iterMatches(word), None) is None]
+
+    @staticmethod
+    def _trie(keys, reverse=False):
+        trie = Trie(reverse)
+        for idx, key in enumerate(keys):
+            trie.insert(key, idx)
+
+        return trie
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check AutocorrectForDevelopers rules for redundant and untested rules.')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    args = parser.parse_args(argv)
+
+    # the explicit tests are the test data for the coverage checks
+    import testMatchPrefix
+    import testMatchSuffix
+
+    violations = RuleLinter.fromFile(args.rules).lint(testMatchSuffix.EXPLICIT_TESTS, testMatchPrefix.EXPLICIT_TESTS)
+    for violation in violations:
+        print(f'{violation.check}: {violation.message}')
+
+    return 1 if violations else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
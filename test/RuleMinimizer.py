@@ -0,0 +1,225 @@
+import argparse
+import bisect
+import collections
+from HotstringSimulator import HotstringSimulator
+from LexiconChecker import LexiconChecker
+from Rule import Rule
+from RuleSet import RuleSet
+from Trie import Trie
+
+# one proposed change: the exact rules in folded are replaced by rule
+Fold = collections.namedtuple('Fold', ['rule', 'folded'])
+
+# Proposes a smaller rule set by folding groups of exact rules into one suffix (':C?:')
+# or prefix (':*:') rule, ex: '::exectue::execute' and '::exectued::executed' become
+# ':*:exectu::execut'. The engine compares suffixes case sensitive, so only ':C:' rules are
+# folded into suffix rules; a ':C?:' rule made from '::exectued::executed' would no longer
+# correct 'EXECTUED'. A fold is only proposed when:
+#   - the new rule does not nest with any kept rule: no kept trigger starts (or ends) with
+#     the new trigger, and no kept prefix (or suffix) rule is the start (or end) of it.
+#     a ':*:' rule fires as soon as its trigger is typed, so it would take over every kept
+#     rule whose trigger starts with it, ex: ':*:claen::clean' and '::claendar::calendar'
+#   - no word of the lexicon starts (or ends) with the new trigger
+#   - typing every trigger of the original rules (case insensitive ones also in upper case
+#     and capitalized), and every lexicon word which contains a new trigger, gives the same
+#     text before and after, keystroke by keystroke (see HotstringSimulator)
+# New rules are appended after all existing rules.
+class RuleMinimizer:
+    minGroup = 3
+
+    # the same limits as test_noThreeLetterSuffixes and test_minimum_prefix_rule_length
+    minSuffixLength = 4
+    minPrefixLength = 5
+
+    def __init__(self, ruleSet: RuleSet, endChars, lexicon=(), minGroup=None):
+        self.ruleSet = ruleSet
+        self.endChars = frozenset(endChars)
+        self.endChar = ' ' if ' ' in self.endChars else min(self.endChars)
+        self.minGroup = minGroup or RuleMinimizer.minGroup
+
+        # sorted words (and reversed words) give every word with a prefix (or suffix) by bisection.
+        # ':*:' rules ignore case, so words are compared in lowercase
+        self.words = sorted({word.lower() for word in lexicon})
+        self.reversedWords = sorted(word[::-1] for word in self.words)
+
+    @staticmethod
+    def fromFile(file, lexicon=(), minGroup=None):
+        return RuleMinimizer(RuleSet.fromFile(file), Rule.getEndChars(file), lexicon, minGroup)
+
+    # returns (folds, rules): the accepted folds and the minimized rules
+    def minimize(self):
+        # the original rules followed by the new rules, removed holds the indices which are not kept
+        self.rules = list(self.ruleSet)
+        self.ruleIndices = {rule: idx for idx, rule in enumerate(self.rules)}
+        self.triggerTrie = Trie()
+        self.reversedTriggerTrie = Trie(reverse=True)
+        for idx in range(len(self.rules)):
+            self._insertTrigger(idx)
+
+        # [(index of the new rule, indices of the folded rules)]
+        accepted = []
+        removed = set()
+        for rule, members in self.candidates():
+            members = tuple(idx for idx in members if idx not in removed)
+            if len(members) < self.minGroup or self._wordsWithTrigger(rule, members):
+                continue
+
+            ruleIdx = len(self.rules)
+            self.rules.append(rule)
+            self.ruleIndices[rule] = ruleIdx
+            if not self._fitsRules(ruleIdx, members, removed):
+                removed.add(ruleIdx)
+                continue
+
+            self._insertTrigger(ruleIdx)
+            accepted.append((ruleIdx, members))
+            removed.update(members)
+
+        accepted = self._verify(accepted, removed)
+        folds = [Fold(self.rules[ruleIdx], [self.rules[idx] for idx in members]) for ruleIdx, members in accepted]
+        return folds, self._keptRules(removed)
+
+    # yields (new rule, indices of the exact rules it could replace), largest groups first
+    def candidates(self):
+        groups = collections.defaultdict(list)
+        for idx, rule in enumerate(self.ruleSet):
+            if rule.prefixMatch or rule.suffixMatch or rule.backspace:
+                continue
+
+            oldText = rule.oldText
+            newText = rule.newText
+            if rule.caseSensitive:
+                for length in range(RuleMinimizer.minSuffixLength, len(oldText) + 1):
+                    # ex: ':C:exectues::executes' => ':C?:tues::utes' when the start is unchanged
+                    start = len(oldText) - length
+                    if newText[:start] == oldText[:start] and newText[start:] != oldText[start:]:
+                        groups[f':C?:{oldText[start:]}::{newText[start:]}'].append(idx)
+                continue
+
+            # the whole trigger is included, so '::shrot::short' is folded into ':*:shrot::short'
+            for length in range(RuleMinimizer.minPrefixLength, len(oldText) + 1):
+                # ex: 'exectued::executed' => ':*:exectu::execut' when the end is unchanged
+                end = oldText[length:]
+                if newText.endswith(end) and newText[:len(newText) - len(end)] != oldText[:length]:
+                    groups[f':*:{oldText[:length]}::{newText[:len(newText) - len(end)]}'].append(idx)
+
+        for line, members in sorted(groups.items(), key=lambda item: (-len(item[1]), item[0])):
+            if len(members) >= self.minGroup:
+                rule = Rule.lineToRule(line)
+                if not any(char in self.endChars for char in rule.oldText + rule.newText):
+                    yield rule, members
+
+    def _insertTrigger(self, idx):
+        self.triggerTrie.insert(self.rules[idx].oldTextLower, idx)
+        self.reversedTriggerTrie.insert(self.rules[idx].oldTextLower, idx)
+
+    # a new rule must not nest with a kept rule of any type, see the class comment
+    def _fitsRules(self, ruleIdx, members, removed):
+        rule = self.rules[ruleIdx]
+        if rule.prefixMatch:
+            nested = list(self.triggerTrie.iterExtensions(rule.oldTextLower))
+            nested.extend(idx for idx in self.triggerTrie.iterMatches(rule.oldTextLower) if self.rules[idx].prefixMatch)
+        else:
+            nested = list(self.reversedTriggerTrie.iterExtensions(rule.oldTextLower))
+            nested.extend(idx for idx in self.reversedTriggerTrie.iterMatches(rule.oldTextLower) if self.rules[idx].suffixMatch)
+
+        members = set(members)
+        return all(idx == ruleIdx or idx in members or idx in removed for idx in nested)
+
+    # returns the lexicon words which start (or end) with the trigger of rule, other than
+    # the folded triggers. the new rule would change them
+    def _wordsWithTrigger(self, rule, members):
+        trigger = rule.oldTextLower
+        if rule.prefixMatch:
+            words = RuleMinimizer._startingWith(self.words, trigger)
+        else:
+            words = [word[::-1] for word in RuleMinimizer._startingWith(self.reversedWords, trigger[::-1])]
+
+        triggers = {self.rules[idx].oldTextLower for idx in members}
+        return [word for word in words if word not in triggers]
+
+    @staticmethod
+    def _startingWith(sortedWords, prefix):
+        start = bisect.bisect_left(sortedWords, prefix)
+        end = start
+        while end < len(sortedWords) and sortedWords[end].startswith(prefix):
+            end += 1
+
+        return sortedWords[start:end]
+
+    # returns the lexicon words which contain one of triggers
+    def _wordsContaining(self, triggers):
+        trie = Trie()
+        for trigger in triggers:
+            trie.insert(trigger, trigger)
+
+        return [word for word in self.words if any(next(trie.iterMatches(word[start:]), None) for start in range(len(word)))]
+
+    def _keptRules(self, removed):
+        return [rule for idx, rule in enumerate(self.rules) if idx not in removed]
+
+    # drops folds until every fold fits the kept rules and typing gives the same text as with
+    # the original rules. dropping a fold keeps its rules again, so the checks are repeated
+    def _verify(self, accepted, removed):
+        words = [rule.oldText for rule in self.ruleSet]
+        # case insensitive rules also correct other casings, which must still be corrected
+        words.extend(variant for rule in self.ruleSet if not rule.caseSensitive
+                     for variant in [rule.oldText.upper(), rule.oldText.capitalize()])
+        words.extend(self._wordsContaining([self.rules[ruleIdx].oldTextLower for ruleIdx, _ in accepted]))
+        before = HotstringSimulator(self.ruleSet, self.endChars)
+        expected = {word: self.type(before, word) for word in words}
+        while accepted:
+            rejected = {fold for fold in accepted if not self._fitsRules(fold[0], fold[1], removed)}
+            if not rejected:
+                after = HotstringSimulator(RuleSet(self._keptRules(removed)), self.endChars)
+                for word in words:
+                    screen, fired = self.type(after, word)
+                    if screen != expected[word][0]:
+                        # the folds whose new rule or folded rules fired, else the folds whose trigger was typed
+                        fired = fired | expected[word][1]
+                        folds = {fold for fold in accepted if fold[0] in fired or fired.intersection(fold[1])}
+                        rejected.update(folds or {fold for fold in accepted if self.rules[fold[0]].oldTextLower in word.lower()} or accepted)
+
+            if not rejected:
+                break
+
+            for ruleIdx, members in rejected:
+                removed.difference_update(members)
+                removed.add(ruleIdx)
+            accepted = [fold for fold in accepted if fold not in rejected]
+
+        return accepted
+
+    # returns (text on screen, indices into self.rules of the rules which fired) after typing
+    # word and an ending char
+    def type(self, simulator, word):
+        simulator.reset()
+        fired = set()
+        for event in simulator.simulate(word + self.endChar):
+            fired.add(self.ruleIndices[event.rule])
+
+        return ''.join(simulator.buffer), fired
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Propose a smaller rule set by folding exact rules into prefix and suffix rules.')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    parser.add_argument('--lexicon', default=LexiconChecker.defaultLexicon, help='word list, one word per line')
+    parser.add_argument('--min-group', type=int, default=RuleMinimizer.minGroup, help='fewest exact rules to fold into one rule')
+    parser.add_argument('-o', '--output', help='write the minimized rule lines to this file')
+    args = parser.parse_args(argv)
+    LexiconChecker.checkLexicon(parser, args.lexicon)
+
+    minimizer = RuleMinimizer.fromFile(args.rules, LexiconChecker.readLexicon(args.lexicon), args.min_group)
+    folds, rules = minimizer.minimize()
+    for fold in folds:
+        print(f'{fold.rule.line} replaces {", ".join(rule.line for rule in fold.folded)}')
+
+    print(f'rules: {len(minimizer.ruleSet)} -> {len(rules)}')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write('; Generated by RuleMinimizer.py. New rules are at the end\n')
+            for rule in rules:
+                f.write(rule.line + '\n')
+
+if __name__ == '__main__':
+    main()
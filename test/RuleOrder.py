@@ -0,0 +1,145 @@
+import argparse
+import heapq
+import json
+from Benchmark import CorpusReplay
+from Corrector import Corrector
+from InstrumentedRuleSet import InstrumentedRuleSet
+from Rule import Rule
+
+# Profile-guided evaluation order for the linear engine (Rule.getReplacementText).
+# The AHK file stays sorted, but the linear scan is cheaper when the rules which fire
+# most often come first. A rule may only move ahead of an earlier rule when no input
+# can match both of them, so the first match (AHK precedence) never changes.
+class RuleOrder:
+    # true when some input may match both rules. Rule.matchRule checks equality for every
+    # rule, startswith for prefix rules and endswith for suffix rules. Comparing the
+    # lowercase triggers covers case sensitive and insensitive rules alike
+    @staticmethod
+    def conflicts(a: Rule, b: Rule):
+        lhs = a.oldTextLower
+        rhs = b.oldTextLower
+        if lhs == rhs:
+            return True
+
+        if (a.prefixMatch and b.suffixMatch) or (a.suffixMatch and b.prefixMatch):
+            # 'PS' matches both ':*:P' and ':?:S'
+            return True
+
+        if (a.prefixMatch and rhs.startswith(lhs)) or (b.prefixMatch and lhs.startswith(rhs)):
+            return True
+
+        return (a.suffixMatch and rhs.endswith(lhs)) or (b.suffixMatch and lhs.endswith(rhs))
+
+    # returns successors[i] = indices j > i of the rules which conflict with rules[i],
+    # found through indexes instead of comparing every pair
+    @staticmethod
+    def conflictGraph(rules):
+        exactIndex = {}
+        prefixIndex = {}
+        suffixIndex = {}
+        for idx, rule in enumerate(rules):
+            exactIndex.setdefault(rule.oldTextLower, []).append(idx)
+            if rule.prefixMatch:
+                prefixIndex.setdefault(rule.oldTextLower, []).append(idx)
+            if rule.suffixMatch:
+                suffixIndex.setdefault(rule.oldTextLower, []).append(idx)
+
+        prefixRules = [idx for indices in prefixIndex.values() for idx in indices]
+        successors = [set() for _ in rules]
+        for idx, rule in enumerate(rules):
+            # every rule also matches on equality, so nested prefix (and suffix) rules
+            # are found through the longer trigger
+            trigger = rule.oldTextLower
+            others = list(exactIndex[trigger])
+            for length in range(1, len(trigger) + 1):
+                others.extend(prefixIndex.get(trigger[:length], ()))
+                others.extend(suffixIndex.get(trigger[-length:], ()))
+
+            if rule.suffixMatch:
+                others.extend(prefixRules)
+
+            for other in others:
+                if other != idx:
+                    successors[min(idx, other)].add(max(idx, other))
+
+        return successors
+
+    # returns the rule indices in evaluation order: among the rules whose earlier
+    # conflicting rules are already placed, the most frequently hit goes next
+    @staticmethod
+    def order(rules, hits):
+        successors = RuleOrder.conflictGraph(rules)
+        inDegree = [0] * len(rules)
+        for others in successors:
+            for other in others:
+                inDegree[other] += 1
+
+        ready = [(-hits.get(rule.line, 0), idx) for idx, rule in enumerate(rules) if inDegree[idx] == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, idx = heapq.heappop(ready)
+            order.append(idx)
+            for other in successors[idx]:
+                inDegree[other] -= 1
+                if inDegree[other] == 0:
+                    heapq.heappush(ready, (-hits.get(rules[other].line, 0), other))
+
+        assert len(order) == len(rules)
+        return order
+
+    # average number of rules the linear scan visits per hit
+    @staticmethod
+    def scanCost(rules, order, hits):
+        total = sum(hits.get(rule.line, 0) for rule in rules)
+        if not total:
+            return 0.0
+
+        return sum((position + 1) * hits.get(rules[idx].line, 0) for position, idx in enumerate(order)) / total
+
+    # returns {rule line: hits} from InstrumentedRuleSet.stats(), ex: Corrector.py --stats-json
+    @staticmethod
+    def hitsFromStats(stats):
+        hits = {}
+        for rule in stats['rules']:
+            hits[rule['line']] = hits.get(rule['line'], 0) + rule['hits']
+
+        return hits
+
+    # writes the rules in evaluation order. the file is read back with Rule.fileToRuleList
+    @staticmethod
+    def writeOrdered(rules, order, file):
+        with open(file, 'w', encoding='utf-8') as f:
+            f.write('; Generated by RuleOrder.py: rules in profile-guided evaluation order. Do not edit\n')
+            for idx in order:
+                f.write(rules[idx].line + '\n')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Order AutocorrectForDevelopers rules by hit count without changing precedence.')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    parser.add_argument('--stats', help='JSON hit counts written by Corrector.py --stats-json')
+    parser.add_argument('--corpus', nargs='*', metavar='PATH',
+                        help='count hits by replaying these paths instead (default: the Python standard library)')
+    parser.add_argument('-o', '--output', default='AutocorrectForDevelopers.ordered.ahk', help='ordered rules file')
+    args = parser.parse_args(argv)
+
+    corrector = Corrector.fromFile(args.rules)
+    if args.stats:
+        with open(args.stats, encoding='utf-8') as f:
+            hits = RuleOrder.hitsFromStats(json.load(f))
+    else:
+        corrector.ruleSet = InstrumentedRuleSet(corrector.ruleSet)
+        CorpusReplay(corrector).run(CorpusReplay.iterTexts(args.corpus or CorpusReplay.defaultCorpus()))
+        hits = RuleOrder.hitsFromStats(corrector.ruleSet.stats())
+
+    rules = list(corrector.ruleSet)
+    order = RuleOrder.order(rules, hits)
+    RuleOrder.writeOrdered(rules, order, args.output)
+
+    before = RuleOrder.scanCost(rules, range(len(rules)), hits)
+    after = RuleOrder.scanCost(rules, order, hits)
+    print(f'wrote {args.output}')
+    print(f'rules scanned per hit: {before:,.1f} -> {after:,.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+import hashlib
+import pathlib
+from Rule import Rule
+from Trie import Trie
+
+# Immutable collection of Rules (in file order) which owns the lookup indexes.
+# lookup() gives the same first-match results as Rule.getReplacementText,
+# but does not depend on the order in which words are looked up.
+class RuleSet:
+    # fromFile() cache: resolved path => (mtime and size, content hash, RuleSet)
+    _cache = {}
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+
+        # exact and whitelist (b0) rules are found by equality, so index them by
+        # their trigger. ex: '::acess::access' => exactIndexLower['acess']
+        # prefix and suffix rules are also indexed here because they match on equality too
+        exactIndex = {}
+        exactIndexLower = {}
+
+        # suffix rules (including ':?b0:' whitelists) are stored back to front.
+        # ex: ':?:tign::ting' is found by walking 'testign' from its last character
+        self.suffixTrie = Trie(reverse=True)
+
+        # prefix rules are matched against the input text (case sensitive)
+        # or the lowercase input text (case insensitive), see Rule.matchRule
+        self.prefixTrie = Trie()
+        self.prefixTrieLower = Trie()
+
+        for idx, rule in enumerate(self.rules):
+            if rule.caseSensitive:
+                exactIndex.setdefault(rule.oldText, []).append(idx)
+            else:
+                exactIndexLower.setdefault(rule.oldTextLower, []).append(idx)
+
+            if rule.suffixMatch:
+                # note: suffixes always compare case sensitive, see Rule.matchRule
+                self.suffixTrie.insert(rule.oldText, idx)
+
+            if rule.prefixMatch:
+                if rule.caseSensitive:
+                    self.prefixTrie.insert(rule.oldText, idx)
+                else:
+                    self.prefixTrieLower.insert(rule.oldText, idx)
+
+        # record precedence once: for each trigger, the first rule which fires with
+        # and without an ending char. ex: exactIndex['ARe'] = (idxWithEndChar, idxWithoutEndChar)
+        self.exactIndex = self._firstMatches(exactIndex)
+        self.exactIndexLower = self._firstMatches(exactIndexLower)
+
+    # loads an AHK file. Each file is parsed once per process and the same RuleSet is
+    # returned until the file changes (checked by mtime and size, then by content hash)
+    @staticmethod
+    def fromFile(file):
+        path = pathlib.Path(Rule.getRelativeFileName(file)).resolve()
+        stat = path.stat()
+        statKey = (stat.st_mtime_ns, stat.st_size)
+
+        cached = RuleSet._cache.get(path)
+        if cached is not None and cached[0] == statKey:
+            return cached[2]
+
+        contentHash = hashlib.sha256(path.read_bytes()).hexdigest()
+        if cached is not None and cached[1] == contentHash:
+            # file was touched, but not changed
+            ruleSet = cached[2]
+        else:
+            ruleSet = RuleSet(Rule.fileToRuleList(str(path)))
+
+        RuleSet._cache[path] = (statKey, contentHash, ruleSet)
+        return ruleSet
+
+    @staticmethod
+    def clearCache():
+        RuleSet._cache.clear()
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __getitem__(self, idx):
+        return self.rules[idx]
+
+    # returns (newText, rule) where rule is None when nothing matches
+    def lookup(self, word: str, hasEndChar: bool):
+        newText, idx = self.find(word, hasEndChar)
+        if idx is None:
+            return newText, None
+
+        return newText, self.rules[idx]
+
+    # returns (correctedWord, rule). Unlike lookup(), the whole word is returned
+    # for suffix rules, ex: 'testign' => 'testing' instead of 'ting', and the case
+    # of what was typed is kept like AHK does, ex: 'Afetr' => 'After'
+    def correct(self, word: str, hasEndChar: bool):
+        newText, rule = self.lookup(word, hasEndChar)
+        if rule is None or rule.backspace:
+            return word, rule
+
+        if rule.prefixMatch:
+            # prefix rules already keep the case of the input, see Rule._replacePreserveCase
+            return newText, rule
+
+        typed = word[len(word) - len(rule.oldText):]
+        if not rule.caseSensitive:
+            newText = Rule.conformCase(typed, newText)
+
+        return word[:len(word) - len(typed)] + newText, rule
+
+    # same as lookup(), but returns the index of the matching rule (or None)
+    def find(self, word: str, hasEndChar: bool):
+        wordLower = word.lower()
+        endCharPos = 0 if hasEndChar else 1
+
+        # every prefix and suffix match fires, so the winner is the first
+        # (in file order) of the matching rules
+        candidates = [
+            self.exactIndex.get(word, (None, None))[endCharPos],
+            self.exactIndexLower.get(wordLower, (None, None))[endCharPos],
+        ]
+        candidates.extend(self.prefixTrie.iterMatches(word))
+        candidates.extend(self.prefixTrieLower.iterMatches(wordLower))
+        if hasEndChar:
+            candidates.extend(self.suffixTrie.iterMatches(word))
+
+        candidates = [idx for idx in candidates if idx is not None]
+        if not candidates:
+            # no match found, return input text
+            return word, None
+
+        idx = min(candidates)
+        newText = Rule.matchRule(self.rules[idx], word, wordLower, hasEndChar)
+        return newText, idx
+
+    # returns a cursor which is advanced one typed character at a time
+    def prefixCursor(self):
+        return PrefixCursor(self)
+
+    def _firstMatches(self, index):
+        firstMatches = {}
+        for key, indices in index.items():
+            firstMatches[key] = tuple(self._firstMatch(indices, key, hasEndChar) for hasEndChar in [True, False])
+
+        return firstMatches
+
+    def _firstMatch(self, indices, word, hasEndChar):
+        for idx in indices:
+            if Rule.matchRule(self.rules[idx], word, word.lower(), hasEndChar) is not None:
+                return idx
+
+        return None
+
+# Base for classes which wrap a RuleSet and can be passed anywhere a RuleSet is used.
+# lookup() and correct() only depend on find() and rules, so subclasses only override find()
+class RuleSetProxy:
+    lookup = RuleSet.lookup
+    correct = RuleSet.correct
+
+    def __init__(self, ruleSet: RuleSet):
+        self.ruleSet = ruleSet
+        self.rules = ruleSet.rules
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __getitem__(self, idx):
+        return self.rules[idx]
+
+    def find(self, word: str, hasEndChar: bool):
+        return self.ruleSet.find(word, hasEndChar)
+
+    def prefixCursor(self):
+        return self.ruleSet.prefixCursor()
+
+# Incrementally matches prefix rules (':*:') as characters are typed. Like AHK, a prefix
+# rule is reported the moment its last character is typed, without waiting for an end char.
+class PrefixCursor:
+    def __init__(self, ruleSet: RuleSet):
+        self.ruleSet = ruleSet
+        self.cursor = ruleSet.prefixTrie.cursor()
+        self.cursorLower = ruleSet.prefixTrieLower.cursor()
+
+    # returns the index of the first (in file order) prefix rule completed by char, or None
+    def advance(self, char: str):
+        matches = list(self.cursor.advance(char))
+        for charLower in char.lower():
+            matches.extend(self.cursorLower.advance(charLower))
+
+        return min(matches) if matches else None
+
+    # true when no prefix rule can match the text typed so far
+    def isDead(self):
+        return self.cursor.isDead() and self.cursorLower.isDead()
+
+    def copy(self):
+        other = PrefixCursor.__new__(PrefixCursor)
+        other.ruleSet = self.ruleSet
+        other.cursor = self.cursor.copy()
+        other.cursorLower = self.cursorLower.copy()
+        return other
@@ -0,0 +1,134 @@
+import argparse
+import collections
+import multiprocessing
+import re
+import sys
+from Corrector import Corrector
+from LookupCache import LookupCache
+from SourceTree import SourceTree
+
+# one word which a rule would rewrite. line and column are 1-based, column counts characters
+Finding = collections.namedtuple('Finding', ['file', 'line', 'column', 'oldText', 'newText', 'rule'])
+
+# Runs the rules over whole source trees (see SourceTree) as a read-only linter and reports
+# the words which a rule would rewrite. Words are split and looked up one at a time by
+# Corrector, so rules whose trigger contains an ending char are not reported, and snake_case
+# is already split. camelCase identifiers are split into their parts when the whole
+# identifier is not corrected, ex: 'getRecieptBakcup' => 'get', 'Reciept', 'Bakcup'.
+# Every word is looked up through the RuleSet tries behind a LookupCache, because identifiers
+# repeat constantly. Files are spread over a process pool and results are streamed per file.
+class Scanner:
+    # lookups cached per process
+    cacheSize = 1 << 16
+
+    # the parts of a camelCase identifier, ex: 'parseHTTPRespnose' => 'parse', 'HTTP', 'Respnose'
+    identifierPartRegex = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+
+    def __init__(self, corrector: Corrector):
+        self.corrector = corrector
+
+    @staticmethod
+    def fromFile(file, cacheSize=None):
+        corrector = Corrector.fromFile(file)
+        cacheSize = Scanner.cacheSize if cacheSize is None else cacheSize
+        if cacheSize:
+            corrector.ruleSet = LookupCache(corrector.ruleSet, cacheSize)
+
+        return Scanner(corrector)
+
+    # returns [(offset, part)] for the parts of a camelCase identifier, or [] for other words
+    @staticmethod
+    def splitIdentifier(word):
+        parts = [(match.start(), match.group()) for match in Scanner.identifierPartRegex.finditer(word)]
+        return parts if len(parts) > 1 else []
+
+    # returns the findings for text. file is only used to fill out the findings
+    def scanText(self, text, file=''):
+        ruleSet = self.corrector.ruleSet
+        findings = []
+        lineNumber = 1
+        column = 1
+        for word, endChar in self.corrector.tokenize([text]):
+            width = len(word) + len(endChar)
+
+            # '\r' is not an ending char, ex: 'afetr\r\n'
+            if word.endswith('\r') and endChar == '\n':
+                word = word[:-1]
+
+            if Corrector.isWord(word):
+                newText, rule = ruleSet.correct(word, endChar != '')
+                if newText != word:
+                    findings.append(Finding(file, lineNumber, column, word, newText, rule))
+                elif rule is None:
+                    # a whitelisted word is not split. a part is always followed by another
+                    # part or by the end of the word
+                    for offset, part in Scanner.splitIdentifier(word):
+                        newText, rule = ruleSet.correct(part, True)
+                        if newText != part:
+                            findings.append(Finding(file, lineNumber, column + offset, part, newText, rule))
+
+            if endChar == '\n':
+                lineNumber += 1
+                column = 1
+            else:
+                column += width
+
+        return findings
+
+    # returns the findings for a file, or None when it is not a text file, see SourceTree.readText
+    def scanFile(self, file):
+        text = SourceTree.readText(file)
+        return None if text is None else self.scanText(text, file)
+
+    # yields (file, findings) for every text file under paths, in order. jobs processes scan
+    # chunkSize files at a time, jobs=1 scans in this process
+    @staticmethod
+    def scan(rulesFile, paths, jobs=None, chunkSize=16, cacheSize=None):
+        files = SourceTree.iterFiles(paths)
+        if jobs == 1:
+            scanner = Scanner.fromFile(rulesFile, cacheSize)
+            for file in files:
+                findings = scanner.scanFile(file)
+                if findings is not None:
+                    yield file, findings
+            return
+
+        with multiprocessing.Pool(jobs, _initWorker, (rulesFile, cacheSize)) as pool:
+            for file, findings in pool.imap(_scanFile, files, chunkSize):
+                if findings is not None:
+                    yield file, findings
+
+# the scanner of a worker process, created once by the pool initializer
+_workerScanner = None
+
+def _initWorker(rulesFile, cacheSize):
+    global _workerScanner
+    _workerScanner = Scanner.fromFile(rulesFile, cacheSize)
+
+def _scanFile(file):
+    return file, _workerScanner.scanFile(file)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report every word in a source tree which AutocorrectForDevelopers rules would rewrite.')
+    parser.add_argument('paths', nargs='+', help='files and directories to scan')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: one per CPU, 1 scans without a pool)')
+    parser.add_argument('--chunk-size', type=int, default=16, help='files sent to a worker at a time')
+    parser.add_argument('--cache', type=int, default=Scanner.cacheSize, metavar='SIZE', help='cache this many word lookups per process')
+    parser.add_argument('--rule', action='store_true', help='print the rule which matched each word')
+    args = parser.parse_args(argv)
+
+    files = 0
+    count = 0
+    for _, findings in Scanner.scan(args.rules, args.paths, args.jobs, args.chunk_size, args.cache):
+        files += 1
+        count += len(findings)
+        for finding in findings:
+            rule = f' ({finding.rule.line})' if args.rule else ''
+            print(f'{finding.file}:{finding.line}:{finding.column}: {finding.oldText} -> {finding.newText}{rule}')
+
+    print(f'files: {files}, findings: {count}', file=sys.stderr)
+    return 1 if count else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import fnmatch
+import os
+
+# Finds and reads the text files under a list of files and directories, for the tools which
+# run the rules over real text (Scanner, Benchmark's CorpusReplay). Directories are walked in
+# sorted order, skipping ignoredDirs and everything matched by a .gitignore file on the way.
+# Binary files (a null byte in the first sniffSize bytes) and files which are not UTF-8 are skipped.
+class SourceTree:
+    # bytes read to decide whether a file is binary
+    sniffSize = 1024
+
+    # directories which are never walked, in addition to the ones in .gitignore files
+    ignoredDirs = frozenset(['.git', '.hg', '.svn', '__pycache__', 'node_modules', '.tox', '.venv', 'venv'])
+
+    # yields the files under paths (files or directories). negated ('!') patterns are not supported
+    @staticmethod
+    def iterFiles(paths):
+        for path in paths:
+            if os.path.isfile(path):
+                yield path
+                continue
+
+            # directory => the patterns of the .gitignore files from path down to its parent.
+            # .gitignore files above path are not read
+            patternsByDir = {}
+            for root, dirs, names in os.walk(path):
+                patterns = patternsByDir.pop(root, []) + SourceTree.readIgnoreFile(root)
+                dirs[:] = sorted(name for name in dirs if name not in SourceTree.ignoredDirs and
+                                 not SourceTree.isIgnored(root, name, True, patterns))
+                for name in dirs:
+                    patternsByDir[os.path.join(root, name)] = patterns
+
+                for name in sorted(names):
+                    if not SourceTree.isIgnored(root, name, False, patterns):
+                        yield os.path.join(root, name)
+
+    # yields (file, text) for every text file under paths
+    @staticmethod
+    def iterTexts(paths):
+        for file in SourceTree.iterFiles(paths):
+            text = SourceTree.readText(file)
+            if text is not None:
+                yield file, text
+
+    # returns the text of a file, or None when the file is binary, not UTF-8 or unreadable
+    @staticmethod
+    def readText(file):
+        try:
+            with open(file, 'rb') as f:
+                data = f.read()
+            if b'\0' in data[:SourceTree.sniffSize]:
+                return None
+            return data.decode('utf-8')
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    # returns [(directory, pattern, dirOnly)] for the .gitignore file in directory
+    @staticmethod
+    def readIgnoreFile(directory):
+        try:
+            with open(os.path.join(directory, '.gitignore'), encoding='utf-8') as f:
+                lines = [line.strip() for line in f]
+        except (OSError, UnicodeDecodeError):
+            return []
+
+        patterns = []
+        for line in lines:
+            if not line or line.startswith('#') or line.startswith('!'):
+                continue
+
+            dirOnly = line.endswith('/')
+            patterns.append((directory, line.rstrip('/'), dirOnly))
+
+        return patterns
+
+    # a pattern with a '/' matches the path below its .gitignore, other patterns match the name
+    @staticmethod
+    def isIgnored(root, name, isDir, patterns):
+        for directory, pattern, dirOnly in patterns:
+            if dirOnly and not isDir:
+                continue
+
+            if '/' in pattern:
+                path = os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+                if fnmatch.fnmatchcase(path, pattern.lstrip('/')):
+                    return True
+            elif fnmatch.fnmatchcase(name, pattern):
+                return True
+
+        return False
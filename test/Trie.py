@@ -0,0 +1,89 @@
+# Character trie which maps string keys to lists of values.
+# A reversed trie stores keys back to front, so it finds keys which are suffixes of the text.
+class Trie:
+    def __init__(self, reverse=False):
+        self.reverse = reverse
+        self.root = TrieNode()
+
+    def insert(self, key: str, value):
+        if self.reverse:
+            key = key[::-1]
+
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = TrieNode()
+                node.children[char] = child
+            node = child
+
+        node.values.append(value)
+
+    # yields the values of every key which is a prefix of text (a suffix of text
+    # for reversed tries), shortest key first. Work is proportional to len(text).
+    def iterMatches(self, text: str):
+        if self.reverse:
+            text = reversed(text)
+
+        node = self.root
+        for char in text:
+            node = node.children.get(char)
+            if node is None:
+                return
+
+            yield from node.values
+
+    # yields the values of every key which starts with text (ends with text for reversed tries)
+    def iterExtensions(self, text: str):
+        cursor = self.cursor()
+        for char in reversed(text) if self.reverse else text:
+            cursor.advance(char)
+
+        nodes = [] if cursor.isDead() else [cursor.node]
+        while nodes:
+            node = nodes.pop()
+            yield from node.values
+            nodes.extend(node.children.values())
+
+    # true when text is the start of some key (the end of some key for reversed tries)
+    def isPrefixOfKey(self, text: str):
+        cursor = self.cursor()
+        for char in reversed(text) if self.reverse else text:
+            cursor.advance(char)
+
+        return not cursor.isDead()
+
+    def cursor(self):
+        return TrieCursor(self.root)
+
+# Walks a trie one character at a time. Each step is a single dict lookup.
+class TrieCursor:
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    # returns the values of keys which end at this character
+    def advance(self, char: str):
+        if self.node is not None:
+            self.node = self.node.children.get(char)
+
+        if self.node is None:
+            # no key starts with the text seen so far
+            return []
+
+        return self.node.values
+
+    # true when no key can match, no matter what is typed next
+    def isDead(self):
+        return self.node is None
+
+    def copy(self):
+        return TrieCursor(self.node)
+
+class TrieNode:
+    __slots__ = ('children', 'values')
+
+    def __init__(self):
+        self.children = {}
+        self.values = []
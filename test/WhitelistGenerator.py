@@ -0,0 +1,100 @@
+import argparse
+import itertools
+import os
+from LexiconChecker import LexiconChecker
+from Rule import Rule
+from RuleSet import RuleSet
+
+# Generates the ':b0:' whitelist blocks at the top of the AHK script from a lexicon.
+# Every real word which a suffix rule would change gets a whitelist entry in the block
+# of that suffix. The lexicon is checked against the rules without any whitelist, so
+# the entries only depend on the correction rules. Blocks look like the existing ones:
+#     ; -lign word suffix whitelist (do not convert these to -ling)
+#     :b0:lign::
+#     :b0:align::
+# Blocks are sorted by suffix and the words in each block alphabetically, which is
+# the order test_whitelistSorted requires.
+class WhitelistGenerator:
+    # an ending which at least this many protected words share is whitelisted once as
+    # ':?b0:', ex: ':?b0:labels::' instead of 'labels' and 'mylabels'
+    minShared = 2
+
+    def __init__(self, ruleSet: RuleSet, endChars, minShared=None):
+        self.suffixRules = [rule for rule in ruleSet if rule.suffixMatch and not rule.backspace]
+        self.checker = LexiconChecker(RuleSet(rule for rule in ruleSet if not rule.backspace), endChars)
+        self.minShared = minShared or WhitelistGenerator.minShared
+
+    @staticmethod
+    def fromFile(file, minShared=None):
+        return WhitelistGenerator(RuleSet.fromFile(file), Rule.getEndChars(file), minShared)
+
+    # returns {suffix rule: [whitelist lines]} for the suffix rules which change a word
+    def blocks(self, words):
+        collisions = self.checker.collisions(words)
+        blocks = {}
+        for idx, changedWords in collisions.items():
+            rule = self.checker.ruleSet[idx]
+            if rule.suffixMatch and not rule.prefixMatch:
+                blocks[rule] = self.whitelist(rule.oldText, [word for word, _ in changedWords])
+
+        return blocks
+
+    # returns the whitelist lines which protect words from the suffix. ':b0:' entries are case
+    # insensitive, so words are lowercased first. words share one ':?b0:' entry for their
+    # longest common ending when at least minShared words end with it, ex: 'malign' and
+    # 'realign' => ':?b0:align::' even when 'align' is not a word of the lexicon. this gives
+    # the fewest lines without protecting any shorter ending than the words have in common.
+    # the suffix itself always comes first, ':?b0:' would disable the suffix rule so it stays ':b0:'
+    def whitelist(self, suffix, words):
+        reversedWords = sorted({word.lower()[::-1] for word in words} - {suffix[::-1]})
+        entries = self._entries(reversedWords, len(suffix))
+        return [f':b0:{suffix}::'] + [line for _, line in sorted(entries)]
+
+    # returns [(word, line)] for reversed words which share their first minLength chars
+    def _entries(self, reversedWords, minLength):
+        if len(reversedWords) == 1:
+            return [(reversedWords[0][::-1], f':b0:{reversedWords[0][::-1]}::')]
+
+        common = os.path.commonprefix(reversedWords)
+        if len(common) > minLength and len(reversedWords) >= self.minShared:
+            return [(common[::-1], f':?b0:{common[::-1]}::')]
+
+        # a word which is the common ending is protected on its own, the others are split by their next char
+        entries = [(common[::-1], f':b0:{common[::-1]}::')] if common in reversedWords else []
+        groups = itertools.groupby((word for word in reversedWords if word != common), key=lambda word: word[len(common)])
+        for _, group in groups:
+            entries.extend(self._entries(list(group), minLength))
+
+        return entries
+
+    # returns the blocks as AHK script text
+    @staticmethod
+    def format(blocks, indent='    '):
+        lines = []
+        for rule in sorted(blocks, key=lambda rule: rule.oldText):
+            lines.append(f'{indent}; -{rule.oldText} word suffix whitelist (do not convert these to -{rule.newText})')
+            lines.extend(indent + line for line in blocks[rule])
+            lines.append('')
+
+        return '\n'.join(lines)
+
+    # suffix rules which change no word of the lexicon, ex: NO_WHITELIST_EXCEPTIONS in testMatchSuffix.py
+    def withoutCollisions(self, blocks):
+        return sorted({rule.oldText for rule in self.suffixRules} - {rule.oldText for rule in blocks})
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the suffix whitelist blocks of the AHK script from a lexicon.')
+    parser.add_argument('--rules', default='AutocorrectForDevelopers.ahk', help='AHK rules file')
+    parser.add_argument('--lexicon', default=LexiconChecker.defaultLexicon, help='word list, one word per line')
+    parser.add_argument('--min-shared', type=int, default=WhitelistGenerator.minShared,
+                        help='use one :?b0: entry for a word when this many protected words end with it')
+    args = parser.parse_args(argv)
+    LexiconChecker.checkLexicon(parser, args.lexicon)
+
+    generator = WhitelistGenerator.fromFile(args.rules, args.min_shared)
+    blocks = generator.blocks(LexiconChecker.readLexicon(args.lexicon))
+    print(WhitelistGenerator.format(blocks))
+    print('    ; suffixes which need no whitelist: ' + ', '.join(generator.withoutCollisions(blocks)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from Benchmark import Benchmark, CorpusReplay
+from Espanso import Espanso
+
+class TestBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.benchmark = Benchmark('AutocorrectForDevelopers.ahk', repeat=1)
+
+    def test_inputs(self):
+        for category in Espanso.categories:
+            hits = self.benchmark.inputs(category, True)
+            self.assertGreater(len(hits), 0)
+            for word, hasEndChar in hits:
+                _, rule = self.benchmark.rules.lookup(word, hasEndChar)
+                self.assertEqual(Espanso.ruleCategory(rule), category)
+
+            misses = self.benchmark.inputs(category, False)
+            self.assertGreater(len(misses), 0)
+            for word, hasEndChar in misses:
+                self.assertIsNone(self.benchmark.rules.lookup(word, hasEndChar)[1])
+
+    def test_evenlySpaced(self):
+        self.assertEqual(Benchmark.evenlySpaced(list(range(10)), 4), [0, 2, 5, 7])
+        self.assertEqual(Benchmark.evenlySpaced(list(range(199)), 40)[-1], 194)
+        self.assertEqual(Benchmark.evenlySpaced([1, 2], 40), [1, 2])
+
+    def test_referenceInputsSpanCategory(self):
+        # the linear scan is timed on rules from the whole file, not only from its start
+        _, ops = self.benchmark.scenarios()['getReplacementText.exact.hit']
+        self.assertEqual(ops, Benchmark.referenceSampleSize)
+
+        rules = list(self.benchmark.rules)
+        reference = Benchmark.evenlySpaced(self.benchmark.inputs('exact', True), Benchmark.referenceSampleSize)
+        lastRule = self.benchmark.rules.lookup(*reference[-1])[1]
+        self.assertGreater(rules.index(lastRule), len(rules) * 3 // 4)
+
+    def test_run(self):
+        report = self.benchmark.run('replacePreserveCase')
+        self.assertEqual(list(report['scenarios']), ['replacePreserveCase'])
+        result = report['scenarios']['replacePreserveCase']
+        self.assertGreater(result['ops'], 0)
+        self.assertGreater(result['nsPerOp'], 0)
+
+    def test_compare(self):
+        baseline = {'scenarios': {'a': {'nsPerOp': 100}, 'b': {'nsPerOp': 100}, 'c': {'nsPerOp': 100}}}
+        report = {'scenarios': {'a': {'nsPerOp': 105}, 'b': {'nsPerOp': 150}, 'd': {'nsPerOp': 1}}}
+        self.assertEqual(Benchmark.compare(baseline, report, 0.1),
+                         [('a', 100, 105, 1.05, False), ('b', 100, 150, 1.5, True)])
+
+class TestCorpusReplay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.replay = CorpusReplay.fromFile('AutocorrectForDevelopers.ahk', lexicon=['Testign'], minCount=2)
+
+    def test_run(self):
+        texts = ['the bakcup afetr testign\n', 'the bakcup mylabels grahp']
+        report = self.replay.run(texts)
+        self.assertEqual(report['files'], 2)
+        self.assertEqual(report['tokens'], 8)
+        self.assertEqual(report['matches'], {'whitelist': 1, 'exact': 3, 'caseSensitive': 0, 'prefix': 1, 'suffix': 1})
+        self.assertEqual(report['corrections'], 5)
+
+        # 'bakcup' is corrected twice and 'testign' is in the lexicon
+        self.assertEqual([(suspect['word'], suspect['newText'], suspect['count']) for suspect in report['suspects']],
+                         [('bakcup', 'backup', 2), ('testign', 'testing', 1)])
+
+    def test_iterTexts(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            os.mkdir(os.path.join(tempDir, 'sub'))
+            with open(os.path.join(tempDir, 'sub', 'a.txt'), 'w', encoding='utf-8') as f:
+                f.write('bakcup')
+            with open(os.path.join(tempDir, 'b.bin'), 'wb') as f:
+                f.write(b'bakcup\0')
+            with open(os.path.join(tempDir, 'c.txt'), 'wb') as f:
+                f.write(b'\xff\xfe')
+
+            self.assertEqual(list(CorpusReplay.iterTexts([tempDir])), ['bakcup'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import unittest
+from Corrector import Corrector
+
+class TestCorrector(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.corrector = Corrector.fromFile('AutocorrectForDevelopers.ahk')
+
+    def test_correctText(self):
+        text, edits = self.corrector.correctText('the bakcup afetr testign valeus(x);\n')
+        self.assertEqual(text, 'the backup after testing values(x);\n')
+        self.assertEqual([(edit.offset, edit.oldText, edit.newText) for edit in edits],
+                         [(4, 'bakcup', 'backup'), (11, 'afetr', 'after'),
+                          (17, 'testign', 'testing'), (25, 'valeus', 'values')])
+
+    def test_keepsCase(self):
+        # like AHK, a capitalized word stays capitalized and a word in all caps stays in all caps
+        text, edits = self.corrector.correctText('Afetr the BAKCUP and Testign valeus.\n')
+        self.assertEqual(text, 'After the BACKUP and Testing values.\n')
+        self.assertEqual([edit.newText for edit in edits], ['After', 'BACKUP', 'Testing', 'values'])
+
+    def test_lastWordWithoutEndChar(self):
+        # exact and suffix rules need an ending char, prefix rules do not
+        text, _ = self.corrector.correctText('bakcup')
+        self.assertEqual(text, 'bakcup')
+
+        text, _ = self.corrector.correctText('grahp')
+        self.assertEqual(text, 'graph')
+
+    def test_whitelist(self):
+        text, edits = self.corrector.correctText('mylabels kabels ')
+        self.assertEqual(text, 'mylabels kabels ')
+        self.assertEqual(edits, [])
+
+    def test_tokenize(self):
+        tokens = list(self.corrector.tokenize(['a_b', 'c<d>', '(e']))
+        self.assertEqual(tokens, [('a', '_'), ('bc', '<'), ('d', '>'), ('', '('), ('e', '')])
+
+    def test_chunkBoundaries(self):
+        # words which span chunks are corrected the same as whole text
+        text = 'bakcup afetr\ttestign, valeus-grahp '
+        expected, expectedEdits = self.corrector.correctText(text)
+        for size in range(1, len(text)):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            edits = []
+            self.assertEqual(''.join(self.corrector.correct(chunks, edits)), expected)
+            self.assertEqual(edits, expectedEdits)
+
+    def test_triggersWithEndChars(self):
+        # words are looked up one at a time, so '::abl eto::able to' never fires here
+        self.assertEqual(self.corrector.correctText('I abl eto go.'), ('I abl eto go.', []))
+
+    def test_longRunWithoutEndChars(self):
+        # a run without ending chars is passed on in bounded pieces and not corrected
+        text = 'teh' * Corrector.maxCarry + ' teh '
+        chunks = [text[i:i + 1000] for i in range(0, len(text), 1000)]
+        tokens = list(self.corrector.tokenize(chunks))
+        self.assertTrue(all(len(word) <= Corrector.maxCarry + 1000 for word, _ in tokens))
+        self.assertEqual(''.join(word + endChar for word, endChar in tokens), text)
+
+        edits = []
+        self.assertEqual(''.join(self.corrector.correct(chunks, edits)), text[:-4] + 'the ')
+        self.assertEqual([edit.offset for edit in edits], [len(text) - 4])
+
+    def test_correctStream(self):
+        inStream = io.StringIO('afetr ' * 10000)
+        outStream = io.StringIO()
+        edits = self.corrector.correctStream(inStream, outStream)
+        self.assertEqual(outStream.getvalue(), 'after ' * 10000)
+        self.assertEqual(len(edits), 10000)
+        self.assertEqual(edits[-1].offset, 6 * 9999)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,18 @@
+import io
+import json
+import os
+import tempfile
 import unittest
 import subprocess
 import textwrap
+from Espanso import Espanso
 from Rule import Rule
+from RuleSet import RuleSet
 
 class TestEspanso(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.rules = Rule.fileToRuleList('AutocorrectForDevelopers.ahk')
+        cls.rules = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
 
     def test_whitelist(self):
         firstWhitelistRule = [rule for rule in self.rules if rule.backspace][0]
@@ -67,13 +73,98 @@ class TestEspanso(unittest.TestCase):
         self.assertTrue(yaml.startswith(exp))
 
     def test_writeToEspansoYamlFile(self):
-        yaml = Rule.convertToEspanso(self.rules)
-
         # write espanso yaml file to git root
         gitRoot = subprocess.check_output(['git', 'rev-parse', '--show-toplevel'],
                                           stderr=subprocess.STDOUT, universal_newlines=True).strip()
-        with open(gitRoot + '/AutocorrectForDevelopers.yaml', 'w', encoding='utf-8') as f:
-            f.write(yaml)
+        # the manifest goes to a temporary directory, so no file is left in the repository
+        with tempfile.TemporaryDirectory() as tempDir:
+            Espanso.writeIncremental(self.rules, gitRoot + '/AutocorrectForDevelopers.yaml',
+                                     os.path.join(tempDir, 'manifest.json'))
+        with open(gitRoot + '/AutocorrectForDevelopers.yaml', encoding='utf-8') as f:
+            self.assertEqual(f.read(), Rule.convertToEspanso(self.rules))
+
+    def test_writeIncremental(self):
+        rules = list(self.rules)
+        with tempfile.TemporaryDirectory() as tempDir:
+            yamlFile = os.path.join(tempDir, 'rules.yaml')
+            self.assertTrue(Espanso.writeIncremental(rules, yamlFile))
+            self.assertTrue(os.path.exists(yamlFile + '.manifest.json'))
+
+            # nothing changed, so nothing is written
+            mtime = os.stat(yamlFile).st_mtime_ns
+            self.assertFalse(Espanso.writeIncremental(rules, yamlFile))
+            self.assertEqual(os.stat(yamlFile).st_mtime_ns, mtime)
+
+            # same size change, longer change, removed rule, added rule
+            rules[10] = Rule.lineToRule(rules[10].line.replace(rules[10].newText, rules[10].newText[::-1]))
+            rules[20] = Rule.lineToRule(rules[20].line + 'xyz')
+            del rules[30]
+            rules.append(Rule.lineToRule('::zzzz::zz'))
+            for _ in range(2):
+                Espanso.writeIncremental(rules, yamlFile)
+                with open(yamlFile, encoding='utf-8') as f:
+                    self.assertEqual(f.read(), Rule.convertToEspanso(rules))
+                rules.pop(5)
+
+    def test_ruleCategory(self):
+        self.assertEqual(Espanso.ruleCategory(Rule.lineToRule(':b0:abels::')), 'whitelist')
+        self.assertEqual(Espanso.ruleCategory(Rule.lineToRule('::acess::access')), 'exact')
+        self.assertEqual(Espanso.ruleCategory(Rule.lineToRule(':C:ARe::Are')), 'caseSensitive')
+        self.assertEqual(Espanso.ruleCategory(Rule.lineToRule(':*:abotu::about')), 'prefix')
+        self.assertEqual(Espanso.ruleCategory(Rule.lineToRule(':?:tign::ting')), 'suffix')
+        self.assertEqual(Espanso.shardName(Rule.lineToRule(':?:tign::ting'), True), 'suffix_t')
+        self.assertEqual(Espanso.shardName(Rule.lineToRule('::(c::©'), True), 'exact_other')
+
+    def test_writeShards(self):
+        for byFirstChar in [False, True]:
+            with tempfile.TemporaryDirectory() as tempDir:
+                written = Espanso.writeShards(self.rules, tempDir, byFirstChar)
+                with open(os.path.join(tempDir, Espanso.indexFileName), encoding='utf-8') as f:
+                    index = json.load(f)['shards']
+                self.assertEqual(sorted(written), sorted([shard['file'] for shard in index] + [Espanso.indexFileName]))
+
+                # every rule is in exactly one shard, in file order
+                blocks = [Rule.convertOneRuleToEspanso(rule) for rule in self.rules]
+                self.assertEqual(sum(shard['rules'] for shard in index), len([block for block in blocks if block]))
+                for shard in index:
+                    with open(os.path.join(tempDir, shard['file']), encoding='utf-8') as f:
+                        name = shard['file'][:-len('.yml')]
+                        expected = [rule for rule in self.rules if Espanso.shardName(rule, byFirstChar) == name]
+                        self.assertEqual(f.read(), Rule.convertToEspanso(expected))
+
+                # nothing changed, so nothing is written
+                self.assertEqual(Espanso.writeShards(self.rules, tempDir, byFirstChar), [])
+
+    def test_writeShardsOnlyChanged(self):
+        rules = list(self.rules)
+        with tempfile.TemporaryDirectory() as tempDir:
+            Espanso.writeShards(rules, tempDir, True)
+
+            rules.append(Rule.lineToRule(':*:zzzz::zz'))
+            self.assertEqual(Espanso.writeShards(rules, tempDir, True), ['prefix_z.yml', Espanso.indexFileName])
+
+            # the shard is removed with its last rule
+            rules.pop()
+            self.assertEqual(Espanso.writeShards(rules, tempDir, True), [Espanso.indexFileName])
+            self.assertFalse(os.path.exists(os.path.join(tempDir, 'prefix_z.yml')))
+
+    def test_writeIncrementalEditedByHand(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            yamlFile = os.path.join(tempDir, 'rules.yaml')
+            Espanso.writeIncremental(self.rules, yamlFile)
+            with open(yamlFile, 'a', encoding='utf-8') as f:
+                f.write('# edit\n')
+
+            # the manifest no longer matches the YAML, so everything is rewritten
+            self.assertTrue(Espanso.writeIncremental(self.rules, yamlFile))
+            with open(yamlFile, encoding='utf-8') as f:
+                self.assertEqual(f.read(), Rule.convertToEspanso(self.rules))
+
+    def test_writeEspansoStream(self):
+        # streaming writes the same text as building the whole document
+        stream = io.StringIO()
+        Rule.writeEspanso(self.rules, stream)
+        self.assertEqual(stream.getvalue(), Rule.convertToEspanso(self.rules))
 
     def test_escapeQuote(self):
         firstQuoteRule = [rule for rule in self.rules if not rule.backspace and not rule.caseSensitive and '"' in rule.oldText][0]
@@ -0,0 +1,87 @@
+import unittest
+from HotstringSimulator import HotstringSimulator, eventType
+
+class TestHotstringSimulator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.simulator = HotstringSimulator.fromFile('AutocorrectForDevelopers.ahk')
+
+    def setUp(self):
+        self.simulator.reset()
+
+    def type(self, keys):
+        return list(self.simulator.simulate(keys))
+
+    def screen(self):
+        return ''.join(self.simulator.buffer)
+
+    def test_exact(self):
+        events = self.type('bakcup ')
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].position, 6)
+        self.assertEqual(events[0].backspaces, 6)
+        self.assertEqual(events[0].text, 'backup')
+        self.assertEqual(eventType(events[0]), 'exact')
+        self.assertEqual(self.screen(), 'backup ')
+
+    def test_exactNeedsEndChar(self):
+        self.assertEqual(self.type('bakcup'), [])
+
+    def test_exactInsideWord(self):
+        # rules without '?' do not match inside other words
+        self.assertEqual(self.type('xbakcup '), [])
+
+    def test_conformCase(self):
+        self.type('Bakcup.')
+        self.assertEqual(self.screen(), 'Backup.')
+
+        self.simulator.reset()
+        self.type('BAKCUP ')
+        self.assertEqual(self.screen(), 'BACKUP ')
+
+    def test_prefixFiresBeforeEndChar(self):
+        events = self.type('grahping ')
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].position, 4)
+        self.assertEqual(eventType(events[0]), 'prefix')
+        self.assertEqual(self.screen(), 'graphing ')
+
+    def test_suffix(self):
+        events = self.type('testign ')
+        self.assertEqual(events[0].backspaces, 4)
+        self.assertEqual(events[0].text, 'ting')
+        self.assertEqual(self.screen(), 'testing ')
+
+    def test_whitelist(self):
+        # ':?b0:labels::' fires first, so '-abels' is not converted to '-ables'
+        events = self.type('mylabels ')
+        self.assertEqual(len(events), 1)
+        self.assertEqual(eventType(events[0]), 'whitelist')
+        self.assertEqual(events[0].backspaces, 0)
+        self.assertEqual(self.screen(), 'mylabels ')
+
+    def test_ruleWithEndChars(self):
+        # the buffer is not reset by ending chars, so multi-word rules match
+        self.type('I abl eto go ')
+        self.assertEqual(self.screen(), 'I able to go ')
+
+    def test_backspace(self):
+        self.type('bakcuq\bp ')
+        self.assertEqual(self.screen(), 'backup ')
+
+    def test_bufferLimit(self):
+        self.type('x' * 1000)
+        self.assertLessEqual(len(self.simulator.buffer), HotstringSimulator.maxBufferLength)
+        self.assertEqual(len(self.simulator.cursors), len(self.simulator.buffer) + 1)
+
+    def test_allPrefixRules(self):
+        # every prefix rule fires on its last character
+        for rule in self.simulator.ruleSet:
+            if rule.prefixMatch:
+                self.simulator.reset()
+                events = self.type(' ' + rule.oldText)
+                self.assertEqual([event.rule for event in events], [rule])
+                self.assertEqual(events[0].position, len(rule.oldText))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import unittest
+from InstrumentedRuleSet import InstrumentedRuleSet
+from Rule import Rule
+from RuleSet import RuleSet
+
+class TestInstrumentedRuleSet(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ruleSet = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
+
+    def setUp(self):
+        self.rules = InstrumentedRuleSet(self.ruleSet)
+
+    def test_sameResults(self):
+        for word in ['acess', 'testign', 'grahping', 'mylabels', 'valid', 'ARe']:
+            for hasEndChar in [True, False]:
+                self.assertEqual(self.rules.lookup(word, hasEndChar), self.ruleSet.lookup(word, hasEndChar))
+                self.assertEqual(self.rules.correct(word, hasEndChar), self.ruleSet.correct(word, hasEndChar))
+
+    def test_counts(self):
+        for word in ['acess', 'acess', 'testign', 'grahping', 'mylabels', 'valid']:
+            self.rules.lookup(word, True)
+
+        stats = self.rules.stats()
+        self.assertEqual(stats['lookups'], 6)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['branches'], {'exact': 2, 'whitelist': 1, 'prefix': 1, 'suffix': 1})
+        self.assertEqual(sum(stats['histogram'].values()), 6)
+        self.assertEqual(stats['unusedRules'], len(self.ruleSet) - 4)
+        self.assertEqual(stats['rules'][0]['line'], '::acess::access')
+        self.assertEqual(stats['rules'][0]['hits'], 2)
+
+        self.assertEqual(json.loads(self.rules.toJson()), stats)
+        self.assertIn('2 ::acess::access', self.rules.report())
+
+        self.rules.reset()
+        self.assertEqual(self.rules.stats()['lookups'], 0)
+
+    def test_matchBranch(self):
+        self.assertEqual(InstrumentedRuleSet.matchBranch(Rule.lineToRule(':*:grahp::graph'), 'Grahp', True), 'exact')
+        self.assertEqual(InstrumentedRuleSet.matchBranch(Rule.lineToRule(':*:grahp::graph'), 'Grahp', False), 'prefix')
+        self.assertEqual(InstrumentedRuleSet.matchBranch(Rule.lineToRule(':?:tign::ting'), 'testign', True), 'suffix')
+        self.assertEqual(InstrumentedRuleSet.matchBranch(Rule.lineToRule(':?b0:labels::'), 'mylabels', True), 'whitelist')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from LexiconChecker import LexiconChecker, main as lexiconCheckerMain
+from RuleMinimizer import main as ruleMinimizerMain
+from WhitelistGenerator import main as whitelistGeneratorMain
+
+class TestLexiconChecker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.checker = LexiconChecker.fromFile('AutocorrectForDevelopers.ahk')
+
+    def test_collisions(self):
+        words = ['campaign', 'sign', 'align', 'labels', 'divideint', "don't", 'graphing']
+        collisions = self.checker.collisions(words)
+        self.assertEqual([(self.checker.ruleSet[idx].line, words) for idx, words in collisions.items()],
+                         [(':C?:eint::ient', [('divideint', 'dividient')])])
+
+    def test_candidates(self):
+        checker, candidates = self.checker.withCandidates([':?:aign::aing', ':*:runn::run', ':?:zzzz::zz'])
+        self.assertEqual(len(checker.ruleSet), len(self.checker.ruleSet) + 3)
+
+        # 'sign' and 'align' are not changed: ':?:aign' does not match 'sign' and 'align' is whitelisted
+        collisions = checker.collisions(['campaign', 'sign', 'align', 'running', 'testign'], candidates)
+        self.assertEqual(collisions, {candidates[0]: [('campaign', 'campaing')], candidates[1]: [('running', 'runing')]})
+
+    def test_readLexicon(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            file = os.path.join(tempDir, 'words')
+            with open(file, 'w', encoding='utf-8') as f:
+                f.write('campaign\n\n  sign \n')
+
+            self.assertEqual(list(LexiconChecker.readLexicon(file)), ['campaign', 'sign'])
+
+    def test_missingLexicon(self):
+        # every tool which reads a lexicon stops with a usage error instead of a traceback
+        with tempfile.TemporaryDirectory() as tempDir:
+            missing = os.path.join(tempDir, 'words')
+            for main in [lexiconCheckerMain, whitelistGeneratorMain, ruleMinimizerMain]:
+                stderr = io.StringIO()
+                with self.assertRaises(SystemExit) as context, contextlib.redirect_stderr(stderr):
+                    main(['--lexicon', missing])
+                self.assertEqual(context.exception.code, 2)
+                self.assertIn('--lexicon', stderr.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from LookupCache import LookupCache
+from RuleSet import RuleSet
+
+class TestLookupCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ruleSet = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
+
+    def test_sameResults(self):
+        cache = LookupCache(self.ruleSet)
+        for _ in range(2):
+            for word in ['acess', 'testign', 'grahping', 'mylabels', 'valid', 'ARe']:
+                for hasEndChar in [True, False]:
+                    self.assertEqual(cache.lookup(word, hasEndChar), self.ruleSet.lookup(word, hasEndChar))
+                    self.assertEqual(cache.correct(word, hasEndChar), self.ruleSet.correct(word, hasEndChar))
+
+        # correct() looks up the same key as lookup()
+        self.assertEqual(cache.hits, 36)
+        self.assertEqual(cache.misses, 12)
+        self.assertEqual(cache.hitRate(), 36 / 48)
+
+    def test_lru(self):
+        cache = LookupCache(self.ruleSet, maxSize=2, policy='lru')
+        for word in ['acess', 'afetr', 'acess', 'testign']:
+            cache.find(word, True)
+
+        # 'afetr' was used least recently
+        self.assertEqual(list(cache.cache), [('acess', True), ('testign', True)])
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_fifo(self):
+        cache = LookupCache(self.ruleSet, maxSize=2, policy='fifo')
+        for word in ['acess', 'afetr', 'acess', 'testign']:
+            cache.find(word, True)
+
+        # 'acess' was inserted first
+        self.assertEqual(list(cache.cache), [('afetr', True), ('testign', True)])
+
+    def test_reload(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            file = os.path.join(tempDir, 'rules.ahk')
+            with open(file, 'w', encoding='utf-8') as f:
+                f.write('::acess::access\n')
+
+            cache = LookupCache.fromFile(file, checkInterval=0)
+            self.assertEqual(cache.lookup('acess', True)[0], 'access')
+
+            with open(file, 'w', encoding='utf-8') as f:
+                f.write('::acess::accessed\n')
+
+            self.assertEqual(cache.lookup('acess', True)[0], 'accessed')
+            self.assertEqual(cache.misses, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,10 @@
 import unittest
-from Rule import Rule
+from RuleSet import RuleSet
 
 class TestMatchCaseSensitive(unittest.TestCase):
     @classmethod
     def setUpClass(self):
-        self.rules = Rule.fileToRuleList('AutocorrectForDevelopers.ahk')
+        self.rules = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
 
         caseSensitiveRules = [rule for rule in self.rules if rule.caseSensitive and not rule.suffixMatch]
         self.caseSensitiveNoPrefixRules = [rule for rule in caseSensitiveRules if not rule.prefixMatch]
@@ -19,37 +19,33 @@ class TestMatchCaseSensitive(unittest.TestCase):
 
     # ex: ":C:itn::int"
     def test_noPrefixMatch(self):
-        startIdx = 0
         hasEndChar = True
         for inputText in self.caseSensitiveNoPrefixList:
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, rule.newText)
             self.assertTrue(rule.caseSensitive)
             self.assertFalse(rule.prefixMatch)
 
         # non-prefix rules need an ending character
         hasEndChar = False
-        startIdx = 0
         for inputText in self.caseSensitiveNoPrefixList:
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, inputText)
             self.assertIsNone(rule)
 
     # ex: ":C*:mkae_::make_"
     def test_prefixMatch(self):
-        startIdx = 0
         hasEndChar = True
         for inputText in self.caseSensitivePrefixList:
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, rule.newText)
             self.assertTrue(rule.caseSensitive)
             self.assertTrue(rule.prefixMatch)
 
         # prefix rules do not need an ending character
-        startIdx = 0
         hasEndChar = False
         for inputText in self.caseSensitivePrefixList:
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, rule.newText)
             self.assertTrue(rule.caseSensitive)
             self.assertTrue(rule.prefixMatch)
@@ -1,12 +1,12 @@
 import unittest
 import collections
-from Rule import Rule
+from RuleSet import RuleSet
 
 # ex: "::abc::def"
 class TestMatchExact(unittest.TestCase):
     @classmethod
     def setUpClass(self):
-        self.rules = Rule.fileToRuleList('AutocorrectForDevelopers.ahk')
+        self.rules = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
 
         self.exactMatchRules = [rule for rule in self.rules
                            if not rule.prefixMatch and not rule.suffixMatch and not rule.backspace and
@@ -19,12 +19,11 @@ class TestMatchExact(unittest.TestCase):
 
     def test_replace(self):
         hasEndChar = True
-        startIdx = 0
         for inputText in self.exactMatchList:
             # these rules are case insensitive, so test with a capital first letter
             inputText = inputText.capitalize()
 
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, rule.newText, 'No match. Check for common prefixes or suffixes.')
             self.assertFalse(rule.prefixMatch)
             self.assertFalse(rule.suffixMatch)
@@ -32,15 +31,14 @@ class TestMatchExact(unittest.TestCase):
 
         # without ending char, these should not be replaced
         hasEndChar = False
-        startIdx = 0
         for inputText in self.exactMatchList:
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, inputText, 'No match. Check for common prefixes or suffixes.')
             self.assertIsNone(rule)
 
     def test_explicit(self):
         for inputText, expectedText in EXPLICIT_TESTS.items():
-            newText, rule, _ = Rule.getReplacementText(self.rules, inputText, True)
+            newText, rule = self.rules.lookup(inputText, True)
             self.assertEqual(inputText, rule.oldText)
             self.assertEqual(expectedText, rule.newText)
             self.assertEqual(expectedText, newText)
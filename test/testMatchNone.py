@@ -1,10 +1,10 @@
 import unittest
-from Rule import Rule
+from RuleSet import RuleSet
 
 class TestMatchNone(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.rules = Rule.fileToRuleList('AutocorrectForDevelopers.ahk')
+        cls.rules = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
 
     def test_ruleLength(self):
         self.assertGreater(len(self.rules), 5900)
@@ -12,7 +12,7 @@ class TestMatchNone(unittest.TestCase):
 
     def test_replace(self):
         for inputText in MATCH_NONE_LIST:
-            newText, rule, _ = Rule.getReplacementText(self.rules, inputText, True)
+            newText, rule = self.rules.lookup(inputText, True)
             self.assertEqual(newText, inputText)
             self.assertIsNone(rule)
 
@@ -1,12 +1,14 @@
 import re
 import unittest
 from Rule import Rule
+from RuleLinter import RuleLinter
+from RuleSet import RuleSet
 
 # ex: ":*:valeu::value" <- the '*' denotes a prefix rule
 class TestMatchPrefix(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.rules = Rule.fileToRuleList('AutocorrectForDevelopers.ahk')
+        cls.rules = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
 
         prefixRules = [rule for rule in cls.rules if rule.prefixMatch]
         cls.prefixRuleList = [rule.oldText for rule in prefixRules]
@@ -17,23 +19,21 @@ class TestMatchPrefix(unittest.TestCase):
 
     def test_replace(self):
         # prefix rules (":*:") match regardless of end char
-        startIdx = 0
         hasEndChar = True
         for inputText in self.prefixRuleList:
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, rule.newText)
             self.assertTrue(rule.prefixMatch)
 
-        startIdx = 0
         hasEndChar = False
         for inputText in self.prefixRuleList:
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, rule.newText)
             self.assertTrue(rule.prefixMatch)
 
     def test_explicit(self):
         for inputText, expectedText in EXPLICIT_TESTS.items():
-            newText, rule, _ = Rule.getReplacementText(self.rules, inputText, False)
+            newText, rule = self.rules.lookup(inputText, False)
             self.assertEqual(newText, expectedText)
             self.assertNotEqual(newText, inputText,
                 'These tests are meant to match beyond what is specified in the rule')
@@ -42,10 +42,7 @@ class TestMatchPrefix(unittest.TestCase):
 
     def test_allPrefixRulesHaveTests(self):
         # every prefix test in ahk script should have an entry in EXPLICIT_TESTS
-        testKeys = list(EXPLICIT_TESTS)
-        for prefix in self.prefixRuleList:
-            testList = [x for x in testKeys if x.startswith(prefix)]
-            self.assertGreater(len(testList), 0, f'The prefix "{prefix}" does not have an automated test')
+        self.assertEqual(RuleLinter(self.rules).untestedPrefixes(EXPLICIT_TESTS), [])
 
     def test_minimum_prefix_rule_length(self):
         min_prefix_len = 5
@@ -1,11 +1,14 @@
 import unittest
 from Rule import Rule
+from RuleLinter import RuleLinter
+from RuleSet import RuleSet
 
 # ex:: ":C?:bilty::bility"
 class TestMatchPrefix(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.rules = Rule.fileToRuleList('AutocorrectForDevelopers.ahk')
+        cls.rules = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
+        cls.linter = RuleLinter(cls.rules)
 
         # get all suffix rules. note: backspace rules should be ignored because they are whitelisted
         suffixRules = [rule for rule in cls.rules if rule.suffixMatch and not rule.backspace]
@@ -28,23 +31,21 @@ class TestMatchPrefix(unittest.TestCase):
 
     def test_replace(self):
         hasEndChar = True
-        startIdx = 0
         for inputText in self.suffixRuleList:
             # suffix rules need a prefix which isn't whitelisted
             inputText = 'prefix' + inputText
 
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, rule.newText)
             self.assertTrue(rule.suffixMatch)
 
         # suffix rules are NOT autocorrected unless they have an end char
         hasEndChar = False
-        startIdx = 0
         for inputText in self.suffixRuleList:
             # suffix rules need a prefix which isn't whitelisted
             inputText = 'prefix' + inputText
 
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, inputText)
             self.assertIsNone(rule)
 
@@ -55,16 +56,11 @@ class TestMatchPrefix(unittest.TestCase):
     def test_noRedundantSuffixRules(self):
         # ensures that no suffix string ends with another string in the list
         # ex: a suffix rule for '-paegs=>-pages' is unnecessary if there is already a rule for '-aegs=>-ages'
-        for i, s1 in enumerate(self.suffixRuleList):
-            for j, s2 in enumerate(self.suffixRuleList):
-                hasRedundantSuffix = i != j and s1.endswith(s2)
-                if hasRedundantSuffix:
-                    # due to nested loop, its faster to self.fail than self.assertFalse
-                    self.fail(f'Found redundant suffix rule: "{s2}" in "{s1}"')
+        self.assertEqual(self.linter.redundantSuffixes(), [])
 
     def test_explicit(self):
         for inputText, expectedText in EXPLICIT_TESTS.items():
-            _, rule, _ = Rule.getReplacementText(self.rules, inputText, True)
+            _, rule = self.rules.lookup(inputText, True)
             self.assertIsNotNone(rule, f'Suffix lookup failed for "{inputText}"')
 
             # perform the string replacement
@@ -76,20 +72,12 @@ class TestMatchPrefix(unittest.TestCase):
 
     def test_allSuffixRulesHaveTests(self):
         # every suffix test in ahk script should have an entry in EXPLICIT_TESTS
-        testKeys = list(EXPLICIT_TESTS)
-        for suffix in self.suffixRuleList:
-            testList = [x for x in testKeys if x.endswith(suffix)]
-            self.assertGreater(len(testList), 0, f'The suffix "{suffix}" does not have an automated test')
+        self.assertEqual(self.linter.untestedSuffixes(EXPLICIT_TESTS), [])
 
     def test_noRedundantExactMatchRule(self):
         # there is no need for a regular rule which is already encompassed by a suffix rule.
         # ex: the rule 'exectues::executes' is unnecessary with this suffix rule ':?:tues::utes'
-        for oldText, newText in self.suffixRuleDict.items():
-            for oldTextExact, newTextExact in self.exactMatchDict.items():
-                hasRedundancy = oldTextExact.endswith(oldText) and newTextExact.endswith(newText)
-                if hasRedundancy:
-                    # due to nested loop, it's faster to self.fail than self.assertFalse
-                    self.fail(f'Redundant exact match: "{oldTextExact}" not needed due to suffix "-{oldText}"')
+        self.assertEqual(self.linter.redundantExactRules(), [])
 
     def test_suffixRulesHaveWhitelist(self):
         # every suffix needs a decision on whether it should be whitelisted.
@@ -1,13 +1,14 @@
 import unittest
 import collections
-from Rule import Rule
+from RuleLinter import RuleLinter
+from RuleSet import RuleSet
 
 # ex: ":b0:align::" whitelists 'align'
 class TestMatchWhitelist(unittest.TestCase):
     @classmethod
     def setUpClass(self):
         # get all rules
-        self.rules = Rule.fileToRuleList('AutocorrectForDevelopers.ahk')
+        self.rules = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
 
         # get whitelist rules
         whitelistRules = [rule for rule in self.rules if rule.backspace]
@@ -20,25 +21,23 @@ class TestMatchWhitelist(unittest.TestCase):
 
     def test_replace(self):
         # whitelists rules are never autocorrected
-        startIdx = 0
         hasEndChar = True
         for inputText in self.whitelistList:
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, inputText)
             self.assertTrue(rule.backspace)
             self.assertFalse(rule.caseSensitive)
 
-        startIdx = 0
         hasEndChar = False
         for inputText in self.whitelistList:
-            newText, rule, startIdx = Rule.getReplacementText(self.rules, inputText, hasEndChar, startIdx)
+            newText, rule = self.rules.lookup(inputText, hasEndChar)
             self.assertEqual(newText, inputText)
             self.assertTrue(rule.backspace)
             self.assertFalse(rule.caseSensitive)
 
     def test_whitelistExplicit(self):
         for inputText in WHITELIST:
-            newText, rule, _ = Rule.getReplacementText(self.rules, inputText, True)
+            newText, rule = self.rules.lookup(inputText, True)
             self.assertIsNotNone(rule, f'Could not find whitelist rule for "{inputText}"')
             # backspace rules preserve the original text
             self.assertEqual(newText, inputText)
@@ -76,29 +75,15 @@ class TestMatchWhitelist(unittest.TestCase):
 def get_suffixes_without_words(whitelist_list):
     suffixes_with_words = get_suffixes_with_words(whitelist_list)
 
-    def shouldInclude(text):
-        return text not in suffixes_with_words and not any(text.endswith(suffix) for suffix in suffixes_with_words)
-
-    result = [text for text in whitelist_list if shouldInclude(text)]
+    # drop suffixes plus rules which end with them
+    result = RuleLinter.wordsWithoutSuffixes(whitelist_list, suffixes_with_words)
     assert len(result) > 400
     return result
 
 # ex: return 'abel' in list of ['abel', 'label', 'x']
 # because "label" ends with "abel"
 def get_suffixes_with_words(whitelist_list):
-    result = []
-
-    # sort shorter words first
-    sorted_words = sorted(whitelist_list, key=len)
-
-    for i, potential_suffix in enumerate(sorted_words):
-        # only need to look after this index
-        for word in sorted_words[i+1:]:
-            if word.endswith(potential_suffix):
-                result.append(potential_suffix)
-                # can safely break after one match due to sorting by length
-                break
-
+    result = RuleLinter.suffixesWithWords(whitelist_list)
     assert len(result) > 30
     return result
 
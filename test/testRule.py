@@ -1,11 +1,14 @@
+import os
+import tempfile
 import unittest
 from Rule import Rule
+from RuleSet import RuleSet
 import string
 
 class TestRule(unittest.TestCase):
     @classmethod
     def setUpClass(self):
-        self.rules = Rule.fileToRuleList('AutocorrectForDevelopers.ahk')
+        self.rules = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
 
     def test_file(self):
         lines = Rule.cleanFile('AutocorrectForDevelopers.ahk')
@@ -56,6 +59,68 @@ class TestRule(unittest.TestCase):
         newText = Rule.getNewText(':C*:sdt`:`:::std`:`:')
         self.assertEqual(newText, 'std::')
 
+    def test_splitLine(self):
+        self.assertEqual(Rule.splitLine('::abc::def'), ('::', 'abc', 'def'))
+        self.assertEqual(Rule.splitLine(':b0:ABC::'), (':b0:', 'ABC', ''))
+        self.assertEqual(Rule.splitLine(':C*:sdt`:`:::std`:`:'), (':C*:', 'sdt::', 'std::'))
+
+    def test_iterRules(self):
+        # expected is what the old parser (one list comprehension per cleaning step) returned for these cases
+        text = (
+            '#SingleInstance Force\n'
+            '#Hotstring EndChars -()`n `t\n'
+            '; leading comment :: with a colon\n'
+            '\n'
+            '   \n'
+            '{\n'
+            '    ::teh::the ; trailing comment\n'
+            '    :C:ARe::Are\t;tab before the comment\n'
+            '}\n'
+            ':*:grahp::graph    ;  spaces before the comment\n'
+            ':?:tign::ting\n'
+            ':b0:lign::\n'
+            ':?b0:align:: ; whitelist\n'
+            ':C*:sdt`:`:::std`:`:\n'
+            '::a`;b::a;b ; escaped semicolon\n'
+            '::semi;colon::semicolon\n'
+            '  ::indented::indented  \n'
+        )
+        expected = [
+            ('::teh::the', 0, 'teh', 'the'),
+            (':C:ARe::Are\t;tab before the comment', Rule.caseSensitiveFlag, 'ARe', 'Are\t;tab before the comment'),
+            (':*:grahp::graph', Rule.prefixMatchFlag, 'grahp', 'graph'),
+            (':?:tign::ting', Rule.suffixMatchFlag, 'tign', 'ting'),
+            (':b0:lign::', Rule.backspaceFlag, 'lign', ''),
+            (':?b0:align::', Rule.backspaceFlag | Rule.suffixMatchFlag, 'align', ''),
+            (':C*:sdt`:`:::std`:`:', Rule.caseSensitiveFlag | Rule.prefixMatchFlag, 'sdt::', 'std::'),
+            ('::a`;b::a;b', 0, 'a;b', 'a;b'),
+            ('::semi;colon::semicolon', 0, 'semi;colon', 'semicolon'),
+            ('::indented::indented', 0, 'indented', 'indented'),
+        ]
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            file = os.path.join(tempDir, 'rules.ahk')
+            with open(file, 'w', encoding='utf-8') as f:
+                f.write(text)
+
+            self.assertEqual(Rule.cleanFile(file), [line for line, _, _, _ in expected])
+            self.assertEqual([(rule.line, rule.flags, rule.oldText, rule.newText) for rule in Rule.iterRules(file)], expected)
+
+    def test_flags(self):
+        rule = Rule.lineToRule(':C?b0:abc::')
+        self.assertEqual(rule.flags, Rule.backspaceFlag | Rule.caseSensitiveFlag | Rule.suffixMatchFlag)
+        self.assertTrue(rule.backspace and rule.caseSensitive and rule.suffixMatch)
+        self.assertFalse(rule.prefixMatch)
+
+        # rules have no per-instance dict
+        with self.assertRaises(AttributeError):
+            rule.extra = 1
+
+    def test_internedText(self):
+        rules = [Rule.lineToRule(':C?:ofrmed::formed'), Rule.lineToRule(':C?:fomred::formed')]
+        self.assertIs(rules[0].newText, rules[1].newText)
+        self.assertIs(rules[0].oldText, rules[0].oldTextLower)
+
     def test_lineToRule(self):
         rule = Rule.lineToRule('::abc::def')
         self.assertFalse(rule.backspace)
@@ -112,6 +177,15 @@ class TestRule(unittest.TestCase):
         # the chars after '`n' below are added by AutocorrectForDevelopers
         self.assertTrue(lines[0].endswith('-()[]{}:;\'"/\\,.?!`n `t<>*``=&|_+@#'))
 
+    def test_getEndChars(self):
+        endChars = Rule.getEndChars('AutocorrectForDevelopers.ahk')
+        self.assertTrue(set('-()[]{}:;\'"/\\,.?!<>*`=&|_+@#') <= endChars)
+        self.assertTrue({'\n', ' ', '\t'} <= endChars)
+        self.assertEqual(len(endChars), 31)
+
+    def test_unescapeAhk(self):
+        self.assertEqual(Rule.unescapeAhk('a`nb`tc``d'), 'a\nb\tc`d')
+
     def test_allRulesMustChangeText(self):
         # prevents a redundant rule where oldText equals newText (causes unnecessary flicker)
         for rule in self.rules:
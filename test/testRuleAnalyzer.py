@@ -0,0 +1,56 @@
+import unittest
+from Rule import Rule
+from RuleAnalyzer import RuleAnalyzer
+from RuleSet import RuleSet
+
+class TestRuleAnalyzer(unittest.TestCase):
+    def deadRules(self, lines):
+        analyzer = RuleAnalyzer(RuleSet(Rule.lineToRule(line) for line in lines))
+        return [(deadRule.rule.line, [lines[idx] for idx in deadRule.winners]) for deadRule in analyzer.deadRules()]
+
+    def test_noDeadRules(self):
+        self.assertEqual(RuleAnalyzer.fromFile('AutocorrectForDevelopers.ahk').deadRules(), [])
+
+    def test_prefixShadowsExact(self):
+        lines = [':*:grahp::graph', '::grahping::graphing', ':*:grahpi::graphi']
+        self.assertEqual(self.deadRules(lines), [('::grahping::graphing', [':*:grahp::graph']),
+                                                 (':*:grahpi::graphi', [':*:grahp::graph'])])
+
+        # a longer prefix rule only takes some of the inputs of a shorter one
+        self.assertEqual(self.deadRules(['::grahping::graphing', ':*:grahpi::graphi', ':*:grahp::graph']), [])
+
+    def test_whitelistHidesCorrection(self):
+        lines = [':?b0:labels::', ':C:mylabels::my labels', ':C?:abels::ables']
+        self.assertEqual(self.deadRules(lines), [(':C:mylabels::my labels', [':?b0:labels::'])])
+
+        # suffixes compare case sensitive, so 'MYLABELS' still reaches a case insensitive rule
+        self.assertEqual(self.deadRules([':?b0:labels::', '::mylabels::my labels']), [])
+
+    def test_suffixShadowsSuffix(self):
+        lines = [':C?:aegs::ages', ':C?:paegs::pages', ':C:exectues::executes', ':C?:tues::utes']
+        self.assertEqual(self.deadRules(lines), [(':C?:paegs::pages', [':C?:aegs::ages'])])
+
+    def test_caseSensitive(self):
+        # one case sensitive rule does not hide every casing of a case insensitive rule
+        self.assertEqual(self.deadRules([':C:Teh::The', '::teh::the']), [])
+        self.assertEqual(self.deadRules(['::teh::the', ':C:Teh::The']), [(':C:Teh::The', ['::teh::the'])])
+
+    def test_possiblyShadowed(self):
+        # 'tEh' still reaches '::teh::the', but it is not one of the casings which are tried
+        lines = [':C:teh::the', ':C:TEH::THE', ':C:Teh::The', ':C:tEH::tHE', '::teh::the']
+        analyzer = RuleAnalyzer(RuleSet(Rule.lineToRule(line) for line in lines))
+        self.assertEqual(analyzer.ruleSet.find('tEh', True)[1], 4)
+        self.assertEqual([(deadRule.idx, deadRule.certain) for deadRule in analyzer.deadRules()], [(4, False)])
+
+        # a case insensitive rule before it takes every casing
+        analyzer = RuleAnalyzer(RuleSet(Rule.lineToRule(line) for line in ['::teh::the', '::teh::then']))
+        self.assertEqual([(deadRule.idx, deadRule.certain) for deadRule in analyzer.deadRules()], [(1, True)])
+
+    def test_exactWhitelist(self):
+        # an exact whitelist only takes one input of a prefix rule
+        self.assertEqual(self.deadRules([':b0:grahp::', ':*:grahp::graph']), [])
+        self.assertEqual(self.deadRules(['::grahp::graph', ':b0:grahp::']), [])
+        self.assertEqual(self.deadRules([':b0:grahp::', '::grahp::graph']), [('::grahp::graph', [':b0:grahp::'])])
+
+if __name__ == '__main__':
+    unittest.main()
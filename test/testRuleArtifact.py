@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from RuleArtifact import RuleArtifact
+from RuleSet import RuleSet
+
+class TestRuleArtifact(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rules = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
+        cls.tempDir = tempfile.TemporaryDirectory()
+        cls.artifactFile = os.path.join(cls.tempDir.name, 'AutocorrectForDevelopers.rules')
+        RuleArtifact.compile('AutocorrectForDevelopers.ahk', cls.artifactFile)
+        cls.artifact = RuleArtifact(cls.artifactFile)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.artifact.close()
+        cls.tempDir.cleanup()
+
+    def test_ruleCount(self):
+        self.assertEqual(len(self.artifact), len(self.rules))
+
+    def test_sameAsRuleSet(self):
+        for rule in self.rules:
+            oldText = rule.oldText
+            for inputText in [oldText, oldText.upper(), 'prefix' + oldText, oldText + 'ing']:
+                for hasEndChar in [True, False]:
+                    self.assertEqual(self.artifact.find(inputText, hasEndChar), self.rules.find(inputText, hasEndChar),
+                                     f'Mismatch for "{inputText}"')
+
+    def test_lookup(self):
+        newText, rule = self.artifact.lookup('bakcup', True)
+        self.assertEqual(newText, 'backup')
+        self.assertEqual(rule.line, '::bakcup::backup')
+
+        newText, rule = self.artifact.lookup('notatypo', True)
+        self.assertEqual(newText, 'notatypo')
+        self.assertIsNone(rule)
+
+    def test_ruleView(self):
+        for idx in [0, len(self.rules) // 2, len(self.rules) - 1]:
+            view = self.artifact.ruleView(idx)
+            rule = self.rules[idx]
+            self.assertEqual((view.flags, view.oldText, view.newText), (rule.flags, rule.oldText, rule.newText))
+
+    def test_isStale(self):
+        self.assertFalse(self.artifact.isStale('AutocorrectForDevelopers.ahk'))
+
+        otherFile = os.path.join(self.tempDir.name, 'other.ahk')
+        with open(otherFile, 'w', encoding='utf-8') as f:
+            f.write('::acess::access\n')
+        self.assertTrue(self.artifact.isStale(otherFile))
+
+    def test_notAnArtifact(self):
+        otherFile = os.path.join(self.tempDir.name, 'other.rules')
+        with open(otherFile, 'wb') as f:
+            f.write(b'\0' * 64)
+
+        with self.assertRaises(AssertionError):
+            RuleArtifact(otherFile)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from Rule import Rule
+from RuleLinter import RuleLinter, Violation
+from RuleSet import RuleSet
+
+class TestRuleLinter(unittest.TestCase):
+    def setUp(self):
+        lines = [':?:aegs::ages', ':?:paegs::pages', ':?:tues::utes', '::exectues::executes', '::alot::a lot',
+                 ':*:grahp::graph', ':*:valeu::value', ':?b0:labels::']
+        self.linter = RuleLinter(RuleSet(Rule.lineToRule(line) for line in lines))
+
+    def test_lint(self):
+        violations = self.linter.lint(['mypaegs', 'exectues'], ['grahping'])
+        self.assertEqual(violations, [
+            Violation('redundantSuffix', 'Found redundant suffix rule: "aegs" in "paegs"'),
+            Violation('redundantExactMatch', 'Redundant exact match: "exectues" not needed due to suffix "-tues"'),
+            Violation('untestedPrefix', 'The prefix "valeu" does not have an automated test'),
+        ])
+
+    def test_untestedSuffixes(self):
+        self.assertEqual(self.linter.untestedSuffixes([]), [
+            'The suffix "aegs" does not have an automated test',
+            'The suffix "paegs" does not have an automated test',
+            'The suffix "tues" does not have an automated test',
+        ])
+
+    def test_suffixesWithWords(self):
+        self.assertEqual(RuleLinter.suffixesWithWords(['label', 'abel', 'x', 'bel']), ['bel', 'abel'])
+        self.assertEqual(RuleLinter.wordsWithoutSuffixes(['label', 'abel', 'x', 'bel'], ['bel']), ['x'])
+
+if __name__ == '__main__':
+    unittest.main()
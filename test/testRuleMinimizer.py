@@ -0,0 +1,92 @@
+import unittest
+from HotstringSimulator import HotstringSimulator
+from Rule import Rule
+from RuleMinimizer import RuleMinimizer
+from RuleSet import RuleSet
+
+class TestRuleMinimizer(unittest.TestCase):
+    endChars = ' .,'
+
+    @staticmethod
+    def minimizer(lines, lexicon=()):
+        return RuleMinimizer(RuleSet(Rule.lineToRule(line) for line in lines), TestRuleMinimizer.endChars, lexicon)
+
+    def test_foldSuffix(self):
+        folds, rules = self.minimizer([':C:anohter::another', ':C:eihter::either', ':C:furhter::further',
+                                       '::teh::the']).minimize()
+        self.assertEqual([fold.rule.line for fold in folds], [':C?:hter::ther'])
+        self.assertEqual([rule.line for rule in rules], ['::teh::the', ':C?:hter::ther'])
+
+    def test_keepsOtherCasings(self):
+        # suffixes compare case sensitive, so ':C?:hter::ther' would not correct 'ANOHTER'
+        lines = ['::anohter::another', '::eihter::either', '::furhter::further']
+        self.assertEqual(self.minimizer(lines).minimize()[0], [])
+
+        # ':*:' rules ignore case like the exact rules they replace
+        minimizer = self.minimizer(['::shrotcut::shortcut', '::shroten::shorten', '::shrothand::shorthand'])
+        folds, rules = minimizer.minimize()
+        after = HotstringSimulator(RuleSet(rules), self.endChars)
+        self.assertEqual(minimizer.type(after, 'SHROTEN')[0], 'SHORTEN ')
+        self.assertEqual(minimizer.type(after, 'Shrotcut')[0], 'Shortcut ')
+
+    def test_foldPrefix(self):
+        folds, rules = self.minimizer(['::shrotcut::shortcut', '::shroten::shorten', '::shrothand::shorthand']).minimize()
+        self.assertEqual([fold.rule.line for fold in folds], [':*:shrot::short'])
+        self.assertEqual(sorted(rule.oldText for rule in folds[0].folded), ['shrotcut', 'shroten', 'shrothand'])
+        self.assertEqual(len(rules), 1)
+
+    def test_minGroup(self):
+        lines = [':C:anohter::another', ':C:eihter::either']
+        self.assertEqual(self.minimizer(lines).minimize()[0], [])
+        minimizer = RuleMinimizer(RuleSet(Rule.lineToRule(line) for line in lines), self.endChars, minGroup=2)
+        self.assertEqual([fold.rule.line for fold in minimizer.minimize()[0]], [':C?:hter::ther'])
+
+    def test_lexiconCollision(self):
+        # 'daughter' ends with 'hter' but is spelled correctly
+        lines = [':C:anohter::another', ':C:eihter::either', ':C:furhter::further']
+        self.assertEqual(self.minimizer(lines, ['daughter']).minimize()[0], [])
+        self.assertEqual(len(self.minimizer(lines, ['other']).minimize()[0]), 1)
+
+    def test_nestedRule(self):
+        # ':C?:hter::ther' would make the existing suffix rule redundant
+        lines = [':C?:ohter::other', ':C:anohter::another', ':C:eihter::either', ':C:furhter::further']
+        self.assertEqual(self.minimizer(lines).minimize()[0], [])
+
+        # a rule of another type with the same trigger
+        lines = ['::furhter::further', ':C:anohter::another', ':C:eihter::either', ':C:brohter::brother']
+        self.assertEqual(self.minimizer(lines).minimize()[0], [])
+
+    def test_keptRuleStartsWithPrefix(self):
+        # ':*:claen::clean' fires while 'claendar' is typed, so '::claendar::calendar' would never fire
+        lines = ['::claendar::calendar', '::claener::cleaner', '::claening::cleaning', '::claened::cleaned']
+        minimizer = self.minimizer(lines, ['calendar'])
+        self.assertEqual(minimizer.minimize()[0], [])
+
+    def test_foldSameTrigger(self):
+        # '::shrot::short' is folded too instead of being kept next to ':*:shrot::short'
+        folds, rules = self.minimizer(['::shrot::short', '::shroten::shorten', '::shrothand::shorthand']).minimize()
+        self.assertEqual([rule.line for rule in rules], [':*:shrot::short'])
+        self.assertEqual(len(folds[0].folded), 3)
+
+    def test_keepsCorrections(self):
+        minimizer = RuleMinimizer.fromFile('AutocorrectForDevelopers.ahk', ['assign', 'comparable', 'shortcut'], minGroup=8)
+        folds, rules = minimizer.minimize()
+        self.assertTrue(folds)
+        self.assertLess(len(rules), len(minimizer.ruleSet))
+
+        # every trigger of the original rules is typed the same, in every casing which was corrected
+        before = HotstringSimulator(minimizer.ruleSet, minimizer.endChars)
+        after = HotstringSimulator(RuleSet(rules), minimizer.endChars)
+        for rule in minimizer.ruleSet:
+            variants = [rule.oldText] if rule.caseSensitive else [rule.oldText, rule.oldText.upper(), rule.oldText.capitalize()]
+            for word in variants:
+                self.assertEqual(minimizer.type(before, word)[0], minimizer.type(after, word)[0])
+
+    def test_wordsWithTrigger(self):
+        minimizer = self.minimizer([], ['hter', 'Daughter', 'other', 'laughter'])
+        minimizer.rules = []
+        self.assertEqual(minimizer._wordsWithTrigger(Rule.lineToRule(':C?:hter::ther'), []), ['hter', 'daughter', 'laughter'])
+        self.assertEqual(minimizer._wordsWithTrigger(Rule.lineToRule(':*:oth::xyz'), []), ['other'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from Rule import Rule
+from RuleOrder import RuleOrder
+from RuleSet import RuleSet
+
+class TestRuleOrder(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rules = list(RuleSet.fromFile('AutocorrectForDevelopers.ahk'))
+
+    def test_conflicts(self):
+        def conflicts(a, b):
+            return RuleOrder.conflicts(Rule.lineToRule(a), Rule.lineToRule(b))
+
+        self.assertTrue(conflicts('::acess::access', ':C:ACESS::ACCESS'))
+        self.assertTrue(conflicts('::grahping::graphing', ':*:grahp::graph'))
+        self.assertTrue(conflicts(':*:grahpi::graphi', ':*:grahp::graph'))
+        self.assertTrue(conflicts('::testign::testing', ':?:tign::ting'))
+        self.assertTrue(conflicts(':?b0:labels::', ':?:abels::ables'))
+        self.assertTrue(conflicts(':*:grahp::graph', ':?:tign::ting'))
+
+        self.assertFalse(conflicts('::acess::access', '::afetr::after'))
+        self.assertFalse(conflicts('::grahp::graph', ':*:grahping::graphing'))
+        self.assertFalse(conflicts('::tign::ting', ':?:testign::testing'))
+
+    def test_conflictGraph(self):
+        rules = self.rules[::25]
+        successors = RuleOrder.conflictGraph(rules)
+        for i in range(len(rules)):
+            for j in range(i + 1, len(rules)):
+                self.assertEqual(j in successors[i], RuleOrder.conflicts(rules[i], rules[j]))
+
+    def test_order(self):
+        # the last rules are the hottest
+        hits = {rule.line: idx for idx, rule in enumerate(self.rules)}
+        order = RuleOrder.order(self.rules, hits)
+        self.assertEqual(sorted(order), list(range(len(self.rules))))
+        self.assertLess(RuleOrder.scanCost(self.rules, order, hits),
+                        RuleOrder.scanCost(self.rules, range(len(self.rules)), hits))
+
+        # the hottest rule which conflicts with nothing is scanned first
+        successors = RuleOrder.conflictGraph(self.rules)
+        conflicting = set().union(*successors)
+        independent = [idx for idx in order if not successors[idx] and idx not in conflicting]
+        self.assertEqual(order[0], max(independent))
+
+    def test_samePrecedence(self):
+        hits = {rule.line: idx for idx, rule in enumerate(self.rules)}
+        order = RuleOrder.order(self.rules, hits)
+        with tempfile.TemporaryDirectory() as tempDir:
+            file = os.path.join(tempDir, 'ordered.ahk')
+            RuleOrder.writeOrdered(self.rules, order, file)
+            ordered = Rule.fileToRuleList(file)
+
+        self.assertEqual([rule.line for rule in ordered], [self.rules[idx].line for idx in order])
+        for rule in self.rules[::120]:
+            for word in [rule.oldText, rule.oldText + 'ing', 'my' + rule.oldText, rule.oldText.upper()]:
+                for hasEndChar in [True, False]:
+                    expected = Rule.getReplacementText(self.rules, word, hasEndChar)
+                    actual = Rule.getReplacementText(ordered, word, hasEndChar)
+                    self.assertEqual(actual[0], expected[0])
+                    self.assertEqual(actual[1].line if actual[1] else None, expected[1].line if expected[1] else None)
+
+    def test_hitsFromStats(self):
+        stats = {'rules': [{'idx': 0, 'line': '::a::b', 'hits': 2}, {'idx': 9, 'line': '::a::b', 'hits': 1}]}
+        self.assertEqual(RuleOrder.hitsFromStats(stats), {'::a::b': 3})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+from Rule import Rule
+from RuleSet import RuleSet, RuleSetProxy
+from testMatchNone import MATCH_NONE_LIST
+
+class TestRuleSet(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rules = Rule.fileToRuleList('AutocorrectForDevelopers.ahk')
+        cls.ruleSet = RuleSet(cls.rules)
+
+        # a sample of triggers plus variants which exercise prefix, suffix, and case matching.
+        # the linear scan is slow on misses, so only every 40th rule is compared
+        inputs = []
+        for rule in cls.rules[::40]:
+            oldText = rule.oldText
+            inputs += [oldText, oldText.capitalize(), oldText.upper(), 'prefix' + oldText, oldText + 'ing']
+
+        cls.inputs = inputs + MATCH_NONE_LIST
+
+    def test_exactIndex(self):
+        idxWithEndChar, idxWithoutEndChar = self.ruleSet.exactIndexLower['acess']
+        self.assertEqual(self.rules[idxWithEndChar].newText, 'access')
+        # exact rules need an ending char
+        self.assertIsNone(idxWithoutEndChar)
+
+        # case sensitive rules are keyed by their original text
+        idx = self.ruleSet.exactIndex['ARe'][0]
+        self.assertEqual(self.rules[idx].newText, 'Are')
+        self.assertNotIn('are', self.ruleSet.exactIndexLower)
+
+        # whitelist rules match with or without an ending char
+        idxWithEndChar, idxWithoutEndChar = self.ruleSet.exactIndexLower['abels']
+        self.assertEqual(idxWithEndChar, idxWithoutEndChar)
+        self.assertTrue(self.rules[idxWithEndChar].backspace)
+
+    def test_sequence(self):
+        self.assertEqual(len(self.ruleSet), len(self.rules))
+        self.assertEqual(list(self.ruleSet), self.rules)
+        self.assertIs(self.ruleSet[0], self.rules[0])
+
+    def test_sameAsLinearScan(self):
+        # the index must return the same first match as the linear scan
+        for hasEndChar in [True, False]:
+            for inputText in self.inputs:
+                newText, rule, idx = Rule.getReplacementText(self.rules, inputText, hasEndChar)
+                expected = newText, (idx if rule else None)
+                self.assertEqual(self.ruleSet.find(inputText, hasEndChar), expected, f'Mismatch for "{inputText}"')
+
+    def test_orderIndependent(self):
+        # lookups do not depend on previous lookups
+        words = [rule.oldText for rule in self.rules]
+        forward = [self.ruleSet.lookup(word, True) for word in words]
+        backward = [self.ruleSet.lookup(word, True) for word in reversed(words)]
+        self.assertEqual(forward, backward[::-1])
+
+    def test_whitelistSuffixPrecedence(self):
+        # ':?b0:labels::' appears before ':?:abels::ables', so it wins for any word ending in 'labels'
+        newText, rule = self.ruleSet.lookup('mylabels', True)
+        self.assertEqual(newText, 'mylabels')
+        self.assertTrue(rule.backspace and rule.suffixMatch)
+
+        newText, rule = self.ruleSet.lookup('tabels', True)
+        self.assertEqual(newText, 'ables')
+        self.assertFalse(rule.backspace)
+
+        # suffix rules need an ending character
+        newText, rule = self.ruleSet.lookup('tabels', False)
+        self.assertEqual(newText, 'tabels')
+        self.assertIsNone(rule)
+
+    def test_prefixCursor(self):
+        # ':*:grahp::graph' fires as soon as 'p' is typed
+        cursor = self.ruleSet.prefixCursor()
+        matches = [cursor.advance(char) for char in 'Grahping']
+        self.assertEqual(matches[:4], [None] * 4)
+        self.assertEqual(self.rules[matches[4]].newText, 'graph')
+        self.assertEqual(matches[5:], [None] * 3)
+        self.assertTrue(cursor.isDead())
+
+    def test_prefixCursorSameAsLookup(self):
+        # every prefix rule completes on its last character when typed from the start of a word
+        for idx, rule in enumerate(self.rules):
+            if not rule.prefixMatch:
+                continue
+
+            cursor = self.ruleSet.prefixCursor()
+            matches = [cursor.advance(char) for char in rule.oldText]
+            matches = [match for match in matches if match is not None]
+            _, expectedIdx = self.ruleSet.find(rule.oldText, False)
+            self.assertEqual(matches, [expectedIdx], f'Cursor mismatch for "{rule.oldText}"')
+
+    def test_fromFileIsCached(self):
+        ruleSet = RuleSet.fromFile('AutocorrectForDevelopers.ahk')
+        self.assertIs(RuleSet.fromFile('AutocorrectForDevelopers.ahk'), ruleSet)
+        self.assertEqual(len(ruleSet), len(self.rules))
+
+    def test_fromFileReloadsChangedFile(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            file = os.path.join(tempDir, 'rules.ahk')
+            with open(file, 'w', encoding='utf-8') as f:
+                f.write('::acess::access\n')
+
+            ruleSet = RuleSet.fromFile(file)
+            self.assertEqual(len(ruleSet), 1)
+
+            # touching the file without changing it keeps the same rules
+            stat = os.stat(file)
+            os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertIs(RuleSet.fromFile(file), ruleSet)
+
+            # changing the file reparses it
+            with open(file, 'a', encoding='utf-8') as f:
+                f.write('::afetr::after\n')
+            os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+
+            newRuleSet = RuleSet.fromFile(file)
+            self.assertIsNot(newRuleSet, ruleSet)
+            self.assertEqual(len(newRuleSet), 2)
+
+    def test_noMatch(self):
+        newText, rule = self.ruleSet.lookup('notatypo', True)
+        self.assertEqual(newText, 'notatypo')
+        self.assertIsNone(rule)
+
+    def test_proxy(self):
+        # a proxy which does not override find() behaves like the RuleSet it wraps
+        proxy = RuleSetProxy(self.ruleSet)
+        self.assertEqual(len(proxy), len(self.ruleSet))
+        self.assertIs(proxy[0], self.ruleSet[0])
+        for word in ['acess', 'Afetr', 'testign', 'notatypo']:
+            self.assertEqual(proxy.lookup(word, True), self.ruleSet.lookup(word, True))
+            self.assertEqual(proxy.correct(word, True), self.ruleSet.correct(word, True))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from Scanner import Scanner
+from SourceTree import SourceTree
+
+class TestScanner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.scanner = Scanner.fromFile('AutocorrectForDevelopers.ahk')
+
+    def scan(self, text):
+        return [(finding.line, finding.column, finding.oldText, finding.newText) for finding in self.scanner.scanText(text)]
+
+    def test_scanText(self):
+        self.assertEqual(self.scan('the bakcup\n  afetr(valeus);\n'),
+                         [(1, 5, 'bakcup', 'backup'), (2, 3, 'afetr', 'after'), (2, 9, 'valeus', 'values')])
+
+    def test_identifiers(self):
+        # snake_case is split on the ending chars, camelCase into its parts when the whole word is not corrected
+        self.assertEqual(self.scan('int getBakcupSize = old_valeus;\n'),
+                         [(1, 8, 'Bakcup', 'Backup'), (1, 25, 'valeus', 'values')])
+        self.assertEqual(self.scan('parseHTTPBakcup\n'), [(1, 10, 'Bakcup', 'Backup')])
+        self.assertEqual(self.scan('getValeus\n'), [(1, 1, 'getValeus', 'getValues')])
+
+    def test_whitelist(self):
+        self.assertEqual(self.scan('mylabels kabels\n'), [])
+
+    def test_lastWordWithoutEndChar(self):
+        # exact rules need an ending char, prefix rules do not
+        self.assertEqual(self.scan('bakcup'), [])
+        self.assertEqual(self.scan('grahp'), [(1, 1, 'grahp', 'graph')])
+
+    def test_windowsLineEndings(self):
+        self.assertEqual(self.scan('x\r\nthe afetr\r\nbakcup\r\n'), [(2, 5, 'afetr', 'after'), (3, 1, 'bakcup', 'backup')])
+
+    def test_splitIdentifier(self):
+        self.assertEqual(Scanner.splitIdentifier('parseHTTPResponse2'),
+                         [(0, 'parse'), (5, 'HTTP'), (9, 'Response'), (17, '2')])
+        self.assertEqual(Scanner.splitIdentifier('value'), [])
+        self.assertEqual(Scanner.splitIdentifier('VALUE'), [])
+
+    def test_scan(self):
+        files = {
+            'a.py': 'bakcup = 1\n',
+            os.path.join('sub', 'b.txt'): 'nothing here\n',
+            os.path.join('sub', 'out.log'): 'bakcup\n',
+            os.path.join('build', 'c.txt'): 'bakcup\n',
+            os.path.join('node_modules', 'd.js'): 'bakcup\n',
+            'e.bin': 'bakcup\0\n',
+            '.gitignore': 'build/\n',
+            os.path.join('sub', '.gitignore'): '*.log\n',
+        }
+        with tempfile.TemporaryDirectory() as tempDir:
+            for name, text in files.items():
+                os.makedirs(os.path.dirname(os.path.join(tempDir, name)), exist_ok=True)
+                with open(os.path.join(tempDir, name), 'w', encoding='utf-8') as f:
+                    f.write(text)
+
+            expected = [os.path.join(tempDir, name) for name in ['.gitignore', 'a.py', 'e.bin', os.path.join('sub', '.gitignore'),
+                                                                 os.path.join('sub', 'b.txt')]]
+            self.assertEqual(list(SourceTree.iterFiles([tempDir])), expected)
+
+            # binary files are skipped, the pool gives the same results in the same order
+            results = list(Scanner.scan('AutocorrectForDevelopers.ahk', [tempDir], jobs=1))
+            self.assertEqual([os.path.relpath(file, tempDir) for file, _ in results],
+                             ['.gitignore', 'a.py', os.path.join('sub', '.gitignore'), os.path.join('sub', 'b.txt')])
+            self.assertEqual([(finding.line, finding.column, finding.oldText) for finding in results[1][1]], [(1, 1, 'bakcup')])
+            pooled = Scanner.scan('AutocorrectForDevelopers.ahk', [tempDir], jobs=2, chunkSize=1)
+            self.assertEqual([(file, [finding._replace(rule=finding.rule.line) for finding in findings]) for file, findings in pooled],
+                             [(file, [finding._replace(rule=finding.rule.line) for finding in findings]) for file, findings in results])
+
+    def test_triggersWithEndChars(self):
+        # words are looked up one at a time like Corrector does, so '::abl eto::able to' is not reported
+        self.assertEqual(self.scan('I abl eto go.\n'), [])
+
+if __name__ == '__main__':
+    unittest.main()
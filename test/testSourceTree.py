@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from SourceTree import SourceTree
+
+class TestSourceTree(unittest.TestCase):
+    @staticmethod
+    def writeFiles(directory, files):
+        for name, data in files.items():
+            os.makedirs(os.path.dirname(os.path.join(directory, name)), exist_ok=True)
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(data)
+
+    def test_iterFiles(self):
+        files = {
+            '.gitignore': b'build/\n/sub/gen/*.py\n',
+            'a.py': b'',
+            os.path.join('build', 'b.py'): b'',
+            os.path.join('sub', '.gitignore'): b'# comment\n*.log\n',
+            os.path.join('sub', 'c.log'): b'',
+            os.path.join('sub', 'gen', 'd.py'): b'',
+            os.path.join('sub', 'gen', 'e.txt'): b'',
+            os.path.join('.git', 'config'): b'',
+        }
+        with tempfile.TemporaryDirectory() as tempDir:
+            self.writeFiles(tempDir, files)
+            expected = ['.gitignore', 'a.py', os.path.join('sub', '.gitignore'), os.path.join('sub', 'gen', 'e.txt')]
+            self.assertEqual([os.path.relpath(file, tempDir) for file in SourceTree.iterFiles([tempDir])], expected)
+
+            # only the .gitignore files from the walked directory down are read
+            sub = os.path.join(tempDir, 'sub')
+            self.assertEqual([os.path.relpath(file, sub) for file in SourceTree.iterFiles([sub])],
+                             ['.gitignore', os.path.join('gen', 'd.py'), os.path.join('gen', 'e.txt')])
+
+            # files are yielded even when they would be ignored
+            self.assertEqual(list(SourceTree.iterFiles([os.path.join(sub, 'c.log')])), [os.path.join(sub, 'c.log')])
+
+    def test_iterTexts(self):
+        files = {'a.txt': 'bakcup'.encode('utf-8'), 'b.bin': b'bakcup\0', 'c.txt': b'\xff\xfe'}
+        with tempfile.TemporaryDirectory() as tempDir:
+            self.writeFiles(tempDir, files)
+            self.assertEqual(list(SourceTree.iterTexts([tempDir])), [(os.path.join(tempDir, 'a.txt'), 'bakcup')])
+            self.assertIsNone(SourceTree.readText(os.path.join(tempDir, 'missing.txt')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from Trie import Trie
+
+class TestTrie(unittest.TestCase):
+    def test_prefixMatches(self):
+        trie = Trie()
+        trie.insert('val', 1)
+        trie.insert('valeu', 2)
+        trie.insert('value', 3)
+
+        # shortest key first
+        self.assertEqual(list(trie.iterMatches('valeus')), [1, 2])
+        self.assertEqual(list(trie.iterMatches('va')), [])
+        self.assertEqual(list(trie.iterMatches('xval')), [])
+
+    def test_suffixMatches(self):
+        trie = Trie(reverse=True)
+        trie.insert('tign', 1)
+        trie.insert('abels', 2)
+        trie.insert('labels', 3)
+
+        self.assertEqual(list(trie.iterMatches('testign')), [1])
+        self.assertEqual(list(trie.iterMatches('myLabels')), [2])
+        self.assertEqual(list(trie.iterMatches('mylabels')), [2, 3])
+        self.assertEqual(list(trie.iterMatches('tigns')), [])
+
+    def test_duplicateKeys(self):
+        trie = Trie()
+        trie.insert('abc', 1)
+        trie.insert('abc', 2)
+        self.assertEqual(list(trie.iterMatches('abcd')), [1, 2])
+
+    def test_cursor(self):
+        trie = Trie()
+        trie.insert('val', 1)
+        trie.insert('valeu', 2)
+
+        cursor = trie.cursor()
+        completed = [list(cursor.advance(char)) for char in 'valeus']
+        self.assertEqual(completed, [[], [], [1], [], [2], []])
+        self.assertTrue(cursor.isDead())
+
+        # once dead, the cursor stays dead
+        self.assertEqual(cursor.advance('v'), [])
+
+    def test_cursorCopy(self):
+        trie = Trie()
+        trie.insert('ab', 1)
+
+        cursor = trie.cursor()
+        cursor.advance('a')
+        other = cursor.copy()
+        cursor.advance('x')
+        self.assertTrue(cursor.isDead())
+        self.assertEqual(other.advance('b'), [1])
+
+    def test_isPrefixOfKey(self):
+        trie = Trie()
+        trie.insert('abc', 1)
+        self.assertTrue(trie.isPrefixOfKey('ab'))
+        self.assertTrue(trie.isPrefixOfKey('abc'))
+        self.assertFalse(trie.isPrefixOfKey('abcd'))
+        self.assertFalse(trie.isPrefixOfKey('b'))
+
+        trie = Trie(reverse=True)
+        trie.insert('abc', 1)
+        self.assertTrue(trie.isPrefixOfKey('bc'))
+        self.assertFalse(trie.isPrefixOfKey('ab'))
+
+    def test_iterExtensions(self):
+        trie = Trie()
+        for idx, key in enumerate(['ab', 'abc', 'abd', 'b']):
+            trie.insert(key, idx)
+        self.assertEqual(sorted(trie.iterExtensions('ab')), [0, 1, 2])
+        self.assertEqual(list(trie.iterExtensions('abcd')), [])
+        self.assertEqual(sorted(trie.iterExtensions('')), [0, 1, 2, 3])
+
+        trie = Trie(reverse=True)
+        for idx, key in enumerate(['tign', 'testign', 'sign']):
+            trie.insert(key, idx)
+        self.assertEqual(sorted(trie.iterExtensions('tign')), [0, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from LexiconChecker import LexiconChecker
+from Rule import Rule
+from RuleSet import RuleSet
+from WhitelistGenerator import WhitelistGenerator
+
+class TestWhitelistGenerator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.generator = WhitelistGenerator.fromFile('AutocorrectForDevelopers.ahk')
+        cls.words = ['align', 'malign', 'misalign', 'realign', 'labels', 'mylabels', 'kabels',
+                     'furnace', 'menace', 'feint', 'sampling', 'abels']
+
+    def test_whitelist(self):
+        self.assertEqual(self.generator.whitelist('lign', ['realign', 'align', 'misalign', 'lign']),
+                         [':b0:lign::', ':?b0:align::'])
+        self.assertEqual(self.generator.whitelist('nace', ['menace', 'furnace']),
+                         [':b0:nace::', ':b0:furnace::', ':b0:menace::'])
+
+    def test_whitelistSharedEnding(self):
+        # 'align' is not one of the words, but both end with it
+        self.assertEqual(self.generator.whitelist('lign', ['malign', 'realign']), [':b0:lign::', ':?b0:align::'])
+        self.assertEqual(self.generator.whitelist('abels', ['kabels', 'mylabels', 'yourlabels']),
+                         [':b0:abels::', ':b0:kabels::', ':?b0:labels::'])
+
+    def test_whitelistIgnoresCase(self):
+        self.assertEqual(self.generator.whitelist('lign', ['Align', 'align']), [':b0:lign::', ':b0:align::'])
+        self.assertEqual(self.generator.whitelist('nace', ['Menace', 'menace', 'furnace']),
+                         [':b0:nace::', ':b0:furnace::', ':b0:menace::'])
+
+    def test_format(self):
+        text = WhitelistGenerator.format(self.generator.blocks(self.words))
+        self.assertTrue(text.startswith('    ; -abels word suffix whitelist (do not convert these to -ables)\n'
+                                        '    :b0:abels::\n'
+                                        '    :b0:kabels::\n'
+                                        '    :?b0:labels::\n'
+                                        '\n'
+                                        '    ; -eint word suffix whitelist (do not convert these to -ient)\n'))
+        self.assertIn('    :b0:lign::\n    :?b0:align::\n', text)
+        self.assertNotIn('sampling', text)
+
+    def test_protectsEveryWord(self):
+        blocks = self.generator.blocks(self.words)
+        whitelist = [Rule.lineToRule(line) for lines in blocks.values() for line in lines]
+        rules = whitelist + [rule for rule in self.generator.checker.ruleSet]
+        checker = LexiconChecker(RuleSet(rules), self.generator.checker.endChars)
+        self.assertEqual(checker.collisions(self.words), {})
+
+    def test_withoutCollisions(self):
+        withoutCollisions = self.generator.withoutCollisions(self.generator.blocks(self.words))
+        self.assertIn('tign', withoutCollisions)
+        self.assertNotIn('lign', withoutCollisions)
+
+if __name__ == '__main__':
+    unittest.main()